@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from config import Config
+from scheduler import SchedulerBusy, PRIORITY_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+NDJSON = "application/x-ndjson"
+
+
+class BatchItem:
+    """One claim to verify - given inline or as the IPFS CID of a submission"""
+    __slots__ = ("index", "id", "claim", "cid", "evidence", "key")
+
+    def __init__(self, index: int, item_id, claim: Optional[str], cid: Optional[str], evidence: str):
+        self.index = index
+        self.id = item_id
+        self.claim = claim
+        self.cid = cid
+        self.evidence = evidence
+        # Identical work within a batch is proven once and reported for every copy
+        source = ["claim", claim] if claim is not None else ["cid", cid]
+        self.key = hashlib.sha256(json.dumps(source + [evidence]).encode()).hexdigest()
+
+
+def parse_batch(payload: Any, max_items: Optional[int] = None) -> List[BatchItem]:
+    """
+    Validate a request body of the form
+
+        {"items": [{"id": "a1", "claim": "...", "evidence": "..."},
+                   {"id": "a2", "cid": "Qm...", "evidence": "..."}]}
+
+    Raises ValueError with a message for the client.
+    """
+    max_items = max_items if max_items is not None else Config.BATCH_MAX_ITEMS
+    if not isinstance(payload, dict) or not isinstance(payload.get("items"), list):
+        raise ValueError('Body must be a JSON object with an "items" list')
+    entries = payload["items"]
+    if not entries:
+        raise ValueError("Batch is empty")
+    if len(entries) > max_items:
+        raise ValueError(f"Batch has {len(entries)} items, the limit is {max_items}")
+
+    items = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Item {index} is not an object")
+        claim, cid, evidence = entry.get("claim"), entry.get("cid"), entry.get("evidence")
+        if (claim is None) == (cid is None):
+            raise ValueError(f'Item {index} needs exactly one of "claim" or "cid"')
+        if not all(isinstance(v, str) and v for v in (claim or cid, evidence)):
+            raise ValueError(f'Item {index} needs a non-empty "evidence" and "claim"/"cid" string')
+        items.append(BatchItem(index, entry.get("id"), claim, cid, evidence))
+    return items
+
+
+class BatchVerifier:
+    """
+    Runs a batch through the shared ProofScheduler as one interactive client.
+
+    At most `concurrency` unique items are in the scheduler at a time, so a
+    large backfill takes its round-robin turn next to other clients and never
+    gets ahead of chain jobs. Results are yielded as each one finishes.
+    """
+
+    def __init__(self, scheduler, prove: Callable[[str, str], Awaitable[Any]],
+                 fetch_claim: Callable[[str], Awaitable[str]], concurrency: Optional[int] = None,
+                 prefetch: Optional[Callable[[List[str]], Awaitable[Any]]] = None):
+        self.scheduler = scheduler
+        self.prove = prove
+        self.fetch_claim = fetch_claim
+        self.concurrency = concurrency if concurrency is not None else Config.BATCH_CONCURRENCY
+        self.prefetch = prefetch  # batch-encodes embeddings ahead of the proofs that need them
+
+    async def _submit(self, job_fn, client_id):
+        while True:
+            try:
+                return await self.scheduler.submit(PRIORITY_INTERACTIVE, job_fn, client_id=client_id)
+            except SchedulerBusy as e:
+                # Queue full - wait roughly until there is room rather than failing the item
+                await asyncio.sleep(min(max(e.eta, 1.0), Config.BATCH_BUSY_RETRY_MAX))
+
+    async def _prefetch(self, items: List[BatchItem], client_id):
+        texts = list(dict.fromkeys(text for item in items if item.claim is not None
+                                   for text in (item.claim, item.evidence)))
+        # Chunked scheduler jobs of this client - the prover is shared, so encoding takes
+        # its turn like any proof and chain jobs never sit behind a whole batch
+        for start in range(0, len(texts), Config.EMBEDDING_PREFETCH_CHUNK):
+            chunk = texts[start:start + Config.EMBEDDING_PREFETCH_CHUNK]
+            try:
+                await self._submit(lambda: self.prefetch(chunk), client_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Embedding prefetch failed, items will be encoded one by one: {e}")
+                return
+
+    async def _verify(self, item: BatchItem, client_id):
+        claim = item.claim
+        if claim is None:
+            claim = await self.fetch_claim(item.cid)
+            if not claim:
+                raise ValueError(f"No content found for CID {item.cid}")
+
+        return await self._submit(lambda: self.prove(claim, item.evidence), client_id)
+
+    async def run(self, items: List[BatchItem], client_id) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one result line per item, in completion order"""
+        groups = OrderedDict()
+        for item in items:
+            groups.setdefault(item.key, []).append(item)
+
+        pending = asyncio.Queue()
+        for key in groups:
+            pending.put_nowait(key)
+        finished = asyncio.Queue()
+
+        async def worker():
+            while not pending.empty():
+                key = pending.get_nowait()
+                try:
+                    result = await self._verify(groups[key][0], client_id)
+                    outcome = {"status": "ok", "result": result.to_dict()}
+                except Exception as e:
+                    outcome = {"status": "error", "error": str(e)[:200]}
+                await finished.put((key, outcome))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(groups)))]
+        if self.prefetch is not None:
+            workers.append(asyncio.create_task(self._prefetch([group[0] for group in groups.values()], client_id)))
+        try:
+            for _ in range(len(groups)):
+                key, outcome = await finished.get()
+                for item in groups[key]:
+                    yield {"type": "result", "index": item.index, "id": item.id, **outcome}
+        finally:
+            # Client went away or the batch is done - stop feeding the scheduler
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # a hostname - could resolve anywhere
+
+
+def authorized(header: Optional[str]) -> bool:
+    """Constant-time bearer token check, so response timing does not leak the token"""
+    expected = f"Bearer {Config.BATCH_API_TOKEN}".encode()
+    return hmac.compare_digest((header or "").encode(), expected)
+
+
+def create_app(verifier: BatchVerifier):
+    """aiohttp application serving POST /verify/batch"""
+    from aiohttp import web
+
+    async def handle_batch(request):
+        if Config.BATCH_API_TOKEN and not authorized(request.headers.get("Authorization")):
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        try:
+            items = parse_batch(await request.json())
+        except ValueError as e:  # json.JSONDecodeError is a ValueError too
+            return web.json_response({"error": str(e)}, status=400)
+
+        unique = len({item.key for item in items})
+        logger.info(f"📦 Batch of {len(items)} item(s), {unique} unique, from {request.remote}")
+
+        response = web.StreamResponse(headers={"Content-Type": NDJSON})
+        await response.prepare(request)
+
+        counts = {"ok": 0, "error": 0}
+        # Same quota key as a WebSocket client on this host, so both share one fair share
+        lines = verifier.run(items, client_id=request.remote)
+        try:
+            async for line in lines:
+                counts[line["status"]] += 1
+                await response.write((json.dumps(line) + "\n").encode())
+        finally:
+            await lines.aclose()  # a disconnect stops the remaining items straight away
+
+        summary = {"type": "done", "total": len(items), "unique": unique, **counts}
+        await response.write((json.dumps(summary) + "\n").encode())
+        await response.write_eof()
+        return response
+
+    app = web.Application(client_max_size=Config.BATCH_MAX_BODY_BYTES)
+    app.router.add_post("/verify/batch", handle_batch)
+    return app
+
+
+async def start_http_api(verifier: BatchVerifier, host: Optional[str] = None, port: Optional[int] = None):
+    """Serve the batch API on FLASK_HOST:FLASK_PORT - returns the runner for cleanup"""
+    from aiohttp import web
+
+    host = host or Config.FLASK_HOST
+    port = port or Config.FLASK_PORT
+    if not Config.BATCH_API_TOKEN and not is_loopback(host):
+        raise ValueError(f"Refusing to serve the batch API on {host} without BATCH_API_TOKEN")
+    runner = web.AppRunner(create_app(verifier))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"📦 Batch HTTP API listening on {host}:{port}")
+    return runner
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class SharedRead:
+    """
+    A blocking chain read shared by all events: concurrent callers wait on
+    one call, and its value is reused for ttl seconds. Failures are not cached.
+    """
+
+    def __init__(self, fn: Callable[[], Any], ttl: float, clock=time.monotonic):
+        self.fn = fn
+        self.ttl = ttl
+        self._clock = clock
+        self._value = _UNSET
+        self._fetched_at = 0.0
+        self._inflight = None
+
+    async def get(self):
+        if self._value is not _UNSET and self._clock() - self._fetched_at < self.ttl:
+            return self._value
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh())
+            # Nobody may be left waiting if every caller was cancelled - don't warn about it
+            self._inflight.add_done_callback(lambda f: f.cancelled() or f.exception())
+        # One caller being cancelled must not cancel the read for the others
+        return await asyncio.shield(self._inflight)
+
+    async def _refresh(self):
+        try:
+            value = await asyncio.to_thread(self.fn)
+            self._value, self._fetched_at = value, self._clock()
+            return value
+        finally:
+            self._inflight = None
+
+
+def read_response(contract, request_id: int):
+    """
+    The stored verification response for a request, or None if nothing was
+    submitted yet. getNewsByRequestId cannot tell: its last field is
+    isProofVerified, which is also False for a settled failed result.
+    Blocking - run it in a thread.
+    """
+    response = contract.functions.getVerificationResponse(request_id).call()
+    return response if response[0] != 0 else None
+
+
+class Article:
+    """One submitted article as stored by the contract"""
+    __slots__ = ("request_id", "content_hash", "reporter", "timestamp")
+
+    def __init__(self, request_id: int, content_hash: str, reporter: str, timestamp: int):
+        self.request_id = request_id
+        self.content_hash = content_hash
+        self.reporter = reporter
+        self.timestamp = timestamp
+
+
+class ArticleLookup:
+    """
+    Articles by request ID, read with getNewsArticles instead of fetching and
+    decoding each submitNews transaction.
+
+    Lookups arriving within `window` seconds are coalesced: nearby request IDs
+    (at most `max_gap` apart) are read with a single range call, so a burst of
+    NewsSubmitted events costs one RPC round-trip.
+    """
+
+    def __init__(self, contract, window: Optional[float] = None, max_gap: Optional[int] = None):
+        self.contract = contract
+        self.window = window if window is not None else Config.ARTICLE_LOOKUP_WINDOW
+        self.max_gap = max_gap if max_gap is not None else Config.ARTICLE_LOOKUP_MAX_GAP
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._flush_task = None
+
+    async def get(self, request_id: int) -> Optional[Article]:
+        """The article, or None if the contract does not have it (yet)"""
+        future = self._pending.get(request_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+        return await asyncio.shield(future)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        await asyncio.gather(*(self._read_span(span, pending) for span in self._spans(sorted(pending))))
+
+    def _spans(self, request_ids: List[int]) -> List[List[int]]:
+        spans = []
+        for request_id in request_ids:
+            if spans and request_id - spans[-1][-1] <= self.max_gap:
+                spans[-1].append(request_id)
+            else:
+                spans.append([request_id])
+        return spans
+
+    async def _read_span(self, span: List[int], pending: Dict[int, asyncio.Future]):
+        # Request IDs start at 1 and articles are stored in order, so ID n sits at index n - 1
+        start, count = span[0] - 1, span[-1] - span[0] + 1
+        try:
+            rows = await asyncio.to_thread(self.contract.functions.getNewsArticles(start, count).call)
+        except Exception as e:
+            for request_id in span:
+                if not pending[request_id].done():
+                    pending[request_id].set_exception(e)
+                    pending[request_id].exception()  # retrieved by the shielded waiters
+            return
+
+        found = {row[0]: Article(*row[:4]) for row in rows}
+        for request_id in span:
+            if not pending[request_id].done():
+                pending[request_id].set_result(found.get(request_id))
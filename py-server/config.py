@@ -14,26 +14,126 @@ class Config:
     CONTRACT_ADDRESS = os.getenv('CONTRACT_ADDRESS', "0x2F926aaB0eC4d0A1B808a335992C840781157596")
     CONTRACT_ABI_PATH = os.getenv('CONTRACT_ABI_PATH', './contract_abi.json')
     
+    # Multi-target mode - JSON list of chain/contract targets, overrides the single target above
+    TARGETS_PATH = os.getenv('TARGETS_PATH', '')
+    
     # Keep backward compatibility
     PRIVATE_KEY = os.getenv('PRIVATE_KEY') 
     
+    # Signer pool - comma separated verifier keys, falls back to PRIVATE_KEY
+    VERIFIER_PRIVATE_KEYS = os.getenv('VERIFIER_PRIVATE_KEYS', '')
+    SIGNER_MIN_BALANCE_WEI = int(os.getenv('SIGNER_MIN_BALANCE_WEI', 10**17))
+    SIGNER_BALANCE_INTERVAL = float(os.getenv('SIGNER_BALANCE_INTERVAL', 60))
+    
+    # Fleet mode - set FLEET_STORE_PATH to a SQLite file shared by the prover processes on this host
+    # (local disk only - not a network filesystem)
+    FLEET_STORE_PATH = os.getenv('FLEET_STORE_PATH', '')
+    FLEET_NODE_ID = os.getenv('FLEET_NODE_ID', '')
+    FLEET_LEASE_SECONDS = float(os.getenv('FLEET_LEASE_SECONDS', 60))
+    FLEET_SWEEP_INTERVAL = float(os.getenv('FLEET_SWEEP_INTERVAL', 15))
+    FLEET_CLAIM_BACKOFF = float(os.getenv('FLEET_CLAIM_BACKOFF', 0.5))
+    FLEET_MAX_ATTEMPTS = int(os.getenv('FLEET_MAX_ATTEMPTS', 3))
+    
+    # Reorg handling - blocks on top of a NewsSubmitted log before it is proven
+    CONFIRMATION_DEPTH = int(os.getenv('CONFIRMATION_DEPTH', 2))
+    CONFIRMATION_POLL_INTERVAL = float(os.getenv('CONFIRMATION_POLL_INTERVAL', 3))
+    PROCESSED_EVENTS_PATH = os.getenv('PROCESSED_EVENTS_PATH', 'processed_events.db')
+    PROCESSING_STALE_SECONDS = float(os.getenv('PROCESSING_STALE_SECONDS', 1800))  # a job still "processing" after this died
+    CONFIRMATION_RESCAN_BLOCKS = int(os.getenv('CONFIRMATION_RESCAN_BLOCKS', 500))  # NewsSubmitted logs re-read on (re)connect
+    
     # Server Configuration
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     FLASK_PORT = int(os.getenv('FLASK_PORT', 5001))
     FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
     
+    # Batch HTTP API (POST /verify/batch on FLASK_HOST:FLASK_PORT)
+    BATCH_API_ENABLED = os.getenv('BATCH_API_ENABLED', 'false').lower() == 'true'
+    # Require "Authorization: Bearer <token>" when set - mandatory unless FLASK_HOST is loopback
+    BATCH_API_TOKEN = os.getenv('BATCH_API_TOKEN', '')
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 10000))
+    BATCH_MAX_BODY_BYTES = int(os.getenv('BATCH_MAX_BODY_BYTES', 64 * 1024 * 1024))
+    BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 2))  # unique items in the scheduler per batch
+    BATCH_BUSY_RETRY_MAX = float(os.getenv('BATCH_BUSY_RETRY_MAX', 30))
+    
     # EZKL Configuration
     ARTIFACTS_DIR = os.getenv('ARTIFACTS_DIR', 'artifacts')
     MODEL_INPUT_SIZE = int(os.getenv('MODEL_INPUT_SIZE', 32))
     MODEL_HIDDEN_SIZE = int(os.getenv('MODEL_HIDDEN_SIZE', 16))
     MODEL_OUTPUT_SIZE = int(os.getenv('MODEL_OUTPUT_SIZE', 1))
     
+    # Bounded ingestion - hard cap on IPFS bodies and on text scanned for features
+    IPFS_MAX_BYTES = int(os.getenv('IPFS_MAX_BYTES', 1024 * 1024))
+    IPFS_CHUNK_SIZE = int(os.getenv('IPFS_CHUNK_SIZE', 16 * 1024))
+    FEATURE_MAX_TOKENS = int(os.getenv('FEATURE_MAX_TOKENS', 4096))
+    FEATURE_MAX_CHARS = int(os.getenv('FEATURE_MAX_CHARS', 64 * 1024))
+    
+    # Shared chain reads - lookups coalesced across events
+    ARTICLE_LOOKUP_WINDOW = float(os.getenv('ARTICLE_LOOKUP_WINDOW', 0.05))  # seconds to collect getNewsArticles lookups
+    ARTICLE_LOOKUP_MAX_GAP = int(os.getenv('ARTICLE_LOOKUP_MAX_GAP', 16))   # request IDs this close share one range read
+    SOURCES_CACHE_SECONDS = float(os.getenv('SOURCES_CACHE_SECONDS', 60))
+    GAS_PRICE_TTL = float(os.getenv('GAS_PRICE_TTL', 5))
+    
+    # Optional embedding similarity feature - changes the model input, so the circuit must be set up again
+    SEMANTIC_FEATURE = os.getenv('SEMANTIC_FEATURE', 'false').lower() == 'true'
+    EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+    EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', 'embedding_cache')
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 64))
+    EMBEDDING_MAX_CHARS = int(os.getenv('EMBEDDING_MAX_CHARS', 2000))  # the model truncates long inputs anyway
+    EMBEDDING_PREFETCH_CHUNK = int(os.getenv('EMBEDDING_PREFETCH_CHUNK', 256))
+    
+    # Deadlines in seconds - per stage, plus an overall budget per chain job
+    IPFS_TIMEOUT = float(os.getenv('IPFS_TIMEOUT', 30))
+    EVIDENCE_TIMEOUT = float(os.getenv('EVIDENCE_TIMEOUT', 90))
+    PROVE_TIMEOUT = float(os.getenv('PROVE_TIMEOUT', 300))
+    # Capped by what is left of JOB_DEADLINE; a failed result gets a full SETTLE_TIMEOUT past it
+    SETTLE_TIMEOUT = float(os.getenv('SETTLE_TIMEOUT', 180))
+    JOB_DEADLINE = float(os.getenv('JOB_DEADLINE', 600))
+    
+    # Prover process isolation and recycling
+    PROVER_ISOLATION = os.getenv('PROVER_ISOLATION', 'true').lower() == 'true'
+    PROVER_MAX_JOBS = int(os.getenv('PROVER_MAX_JOBS', 50))
+    PROVER_MAX_RSS_MB = int(os.getenv('PROVER_MAX_RSS_MB', 2048))
+    
+    # Startup - seconds allowed for the background warm-up, and opt-in SO_REUSEPORT so a
+    # replacement process can bind port 8765 while the old one is still draining. Off by
+    # default: an accidental second instance then fails to bind instead of also proving
+    WARMUP_TIMEOUT = float(os.getenv('WARMUP_TIMEOUT', 300))
+    REUSE_PORT = os.getenv('REUSE_PORT', 'false').lower() == 'true'
+    
+    # Logging - json or text records written by a background thread
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    LOG_MAX_FIELD_CHARS = int(os.getenv('LOG_MAX_FIELD_CHARS', 512))
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 0.05))  # share of requests keeping DEBUG output
+    
+    # Scheduler Configuration - chain jobs always win over interactive requests
+    SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', 1))
+    SCHEDULER_MAX_QUEUE = int(os.getenv('SCHEDULER_MAX_QUEUE', 32))
+    SCHEDULER_CLIENT_QUOTA = int(os.getenv('SCHEDULER_CLIENT_QUOTA', 2))
+    SCHEDULER_INITIAL_ETA = float(os.getenv('SCHEDULER_INITIAL_ETA', 5.0))
+    
+    # Verification feed - per-subscriber send buffer before a slow client is dropped
+    FEED_BUFFER_SIZE = int(os.getenv('FEED_BUFFER_SIZE', 256))
+    
+    # Local news index - SQLite file fed from NewsSubmitted/NewsVerified events
+    NEWS_INDEX_PATH = os.getenv('NEWS_INDEX_PATH', 'news_index.db')
+    NEWS_PAGE_SIZE = int(os.getenv('NEWS_PAGE_SIZE', 20))
+    NEWS_MAX_PAGE_SIZE = int(os.getenv('NEWS_MAX_PAGE_SIZE', 100))
+    
+    # Pre-flight verification of proofs in a local EVM (needs web3[tester], and py-solc-x unless verifier.bin exists)
+    PREFLIGHT_ENABLED = os.getenv('PREFLIGHT_ENABLED', 'false').lower() == 'true'
+    PREFLIGHT_SOLC_VERSION = os.getenv('PREFLIGHT_SOLC_VERSION', '0.8.20')
+    PREFLIGHT_GAS_BUFFER = int(os.getenv('PREFLIGHT_GAS_BUFFER', 150000))
+    PREFLIGHT_BATCH_SIZE = int(os.getenv('PREFLIGHT_BATCH_SIZE', 8))
+    PREFLIGHT_BATCH_WINDOW = float(os.getenv('PREFLIGHT_BATCH_WINDOW', 0.05))
+    
     @classmethod
     def validate_config(cls):
         """Validate required configuration"""
         if not cls.CONTRACT_ADDRESS:
             print("Warning: CONTRACT_ADDRESS not set - contract events won't work")
-        if not cls.PRIVATE_KEY:
+        if not cls.PRIVATE_KEY and not cls.VERIFIER_PRIVATE_KEYS:
             print("Warning: PRIVATE_KEY not set - running in read-only mode")
         if cls.WEB3_HTTP_URI == "https://polygon-amoy.g.alchemy.com/v2/YOUR_API_KEY":
             print("Warning: Using default Web3 URI - please set WEB3_HTTP_URI")
@@ -59,4 +159,5 @@ class Paths:
     
     # Contract paths
     SOL_CODE_PATH = "artifacts/contracts/verifier.sol"
-    ABI_PATH = "artifacts/contracts/verifier.abi" 
\ No newline at end of file
+    ABI_PATH = "artifacts/contracts/verifier.abi"
+    VERIFIER_BIN_PATH = "artifacts/contracts/verifier.bin" 
\ No newline at end of file
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def to_int(value) -> int:
+    """Raw subscription logs carry hex quantities"""
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def to_hex(value) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if hasattr(value, "hex") and not isinstance(value, str):
+        value = value.hex()
+    value = str(value).lower()
+    return value if value.startswith("0x") else "0x" + value
+
+
+class _PendingLog:
+    __slots__ = ("block_number", "block_hash", "payload")
+
+    def __init__(self, block_number, block_hash, payload):
+        self.block_number = block_number
+        self.block_hash = block_hash
+        self.payload = payload
+
+
+class ConfirmationQueue:
+    """
+    Holds logs until they are CONFIRMATION_DEPTH blocks deep.
+
+    Before a log is released its block hash is checked against the canonical
+    chain, so logs from an orphaned branch are dropped even if the node never
+    sends the matching removed=true notification.
+    """
+
+    def __init__(self, web3, on_confirmed: Callable[[tuple, object], Awaitable[None]],
+                 depth: Optional[int] = None, poll_interval: Optional[float] = None):
+        self.web3 = web3
+        self.on_confirmed = on_confirmed
+        self.depth = depth if depth is not None else Config.CONFIRMATION_DEPTH
+        self.poll_interval = poll_interval if poll_interval is not None else Config.CONFIRMATION_POLL_INTERVAL
+        self._pending = {}
+        self._task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, key):
+        return key in self._pending
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll())
+
+    def stop(self):
+        """Stop polling - logs still pending are dropped"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending.clear()
+
+    async def add(self, key: tuple, block_number, block_hash, payload):
+        """Queue a log - released straight away when no confirmations are required"""
+        if self.depth <= 0:
+            await self.on_confirmed(key, payload)
+            return
+        self._pending[key] = _PendingLog(to_int(block_number), to_hex(block_hash), payload)
+        logger.info(f"⏳ Waiting for {self.depth} confirmation(s) on {key}")
+
+    def discard(self, key: tuple) -> bool:
+        """Forget a log that was removed by a reorg - True if it had not been released yet"""
+        return self._pending.pop(key, None) is not None
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._pending:
+                continue
+            try:
+                await self.release_confirmed()
+            except Exception as e:
+                logger.error(f"❌ Confirmation check failed: {e}")
+
+    async def release_confirmed(self):
+        head = await asyncio.to_thread(lambda: self.web3.eth.block_number)
+        ready = [(key, item) for key, item in self._pending.items()
+                 if head - item.block_number >= self.depth]
+
+        for key, item in ready:
+            block = await asyncio.to_thread(self.web3.eth.get_block, item.block_number)
+            if key not in self._pending:
+                continue  # removed while we were checking
+            del self._pending[key]
+            if to_hex(block['hash']) != item.block_hash:
+                logger.warning(f"⚠️ Log {key} is no longer on the canonical chain - dropping")
+                continue
+            await self.on_confirmed(key, item.payload)
@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Optional dependency - the semantic feature cannot be enabled without it
+try:
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    SEMANTIC_AVAILABLE = False
+
+KEY_BYTES = 16
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by text hash, in two memory-mapped files: <path>.vec
+    holds float32 rows and <path>.keys the hash of each row. Rows are
+    appended and the key is written last, so a crash mid-write leaves at most
+    one unindexed row. One writer per file - each prover process owns its cache.
+    """
+
+    def __init__(self, path: str, dim: int, initial_rows: int = 1024):
+        self.dim = dim
+        self._vec_path = f"{path}.vec"
+        self._key_path = f"{path}.keys"
+        existing = os.path.getsize(self._key_path) // KEY_BYTES if os.path.exists(self._key_path) else 0
+        self._open(max(initial_rows, existing))
+
+        # Rows are filled in order - the first empty key marks the end
+        filled = self._keys.any(axis=1)
+        self._count = int(filled.argmin()) if not filled.all() else self._capacity
+        self._index = {self._keys[row].tobytes(): row for row in range(self._count)}
+
+    def _open(self, capacity: int):
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        # Both files always grow together - any other size means vectors of another dimension
+        if os.path.exists(self._vec_path) and os.path.exists(self._key_path):
+            rows = os.path.getsize(self._key_path) // KEY_BYTES
+            if os.path.getsize(self._vec_path) != rows * row_bytes:
+                raise ValueError(f"Embedding cache {self._vec_path} does not hold {self.dim}-dimensional vectors")
+        for path, size in ((self._vec_path, capacity * row_bytes), (self._key_path, capacity * KEY_BYTES)):
+            with open(path, "ab") as f:
+                if f.tell() < size:
+                    f.truncate(size)
+
+        self._capacity = capacity
+        self._vectors = np.memmap(self._vec_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._keys = np.memmap(self._key_path, dtype=np.uint8, mode="r+", shape=(capacity, KEY_BYTES))
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key: bytes):
+        return key in self._index
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        row = self._index.get(key)
+        return None if row is None else np.array(self._vectors[row])
+
+    def put(self, key: bytes, vector: np.ndarray):
+        if key in self._index:
+            return
+        if self._count == self._capacity:
+            self.flush()
+            self._open(self._capacity * 2)
+        row = self._count
+        self._vectors[row] = vector
+        self._keys[row] = np.frombuffer(key, dtype=np.uint8)
+        self._index[key] = row
+        self._count += 1
+
+    def flush(self):
+        self._vectors.flush()
+        self._keys.flush()
+
+
+class SemanticSimilarity:
+    """
+    Claim-evidence cosine similarity from a sentence-transformers model on CPU.
+
+    Texts are encoded in batches and only once: every embedding is cached by
+    text hash, so repeated claims and shared evidence cost a lookup.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, cache_path: Optional[str] = None,
+                 batch_size: Optional[int] = None, model=None):
+        model_name = model_name or Config.EMBEDDING_MODEL
+        self.batch_size = batch_size or Config.EMBEDDING_BATCH_SIZE
+        self.model = model if model is not None else SentenceTransformer(model_name, device="cpu")
+        dim = self.model.get_sentence_embedding_dimension()
+        # One cache file per model - vectors of different models never mix
+        suffix = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.cache = EmbeddingCache(f"{cache_path or Config.EMBEDDING_CACHE_PATH}.{suffix}", dim)
+        logger.info(f"🧭 Semantic similarity using {model_name} ({dim} dims, {len(self.cache)} cached)")
+
+    def embed(self, texts: Sequence[str]) -> Dict[bytes, np.ndarray]:
+        """Unit-length embeddings by text key, encoding only texts not cached yet"""
+        texts = [text[:Config.EMBEDDING_MAX_CHARS] for text in texts]
+        missing = {}
+        for text in texts:
+            key = text_key(text)
+            if key not in self.cache and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self.model.encode(
+                list(missing.values()),
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+            for key, vector in zip(missing, vectors):
+                self.cache.put(key, vector)
+            self.cache.flush()
+
+        return {text_key(text): self.cache.get(text_key(text)) for text in texts}
+
+    def similarities(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        """Cosine similarity of each (claim, evidence) pair, mapped to 0-1"""
+        vectors = self.embed([text for pair in pairs for text in pair])
+        scores = []
+        for claim, evidence in pairs:
+            cosine = float(np.dot(
+                vectors[text_key(claim[:Config.EMBEDDING_MAX_CHARS])],
+                vectors[text_key(evidence[:Config.EMBEDDING_MAX_CHARS])]
+            ))
+            scores.append(min(max((cosine + 1.0) / 2.0, 0.0), 1.0))
+        return scores
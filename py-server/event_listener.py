@@ -1,151 +1,369 @@
 import asyncio
+import importlib
 import json
 import logging
 import signal
+import socket
 import sys
 import os
 from typing import Dict, Any
 
-from web3 import Web3
 from websockets.server import serve
 from websockets import connect
 from websockets.exceptions import ConnectionClosed
-import aiohttp
-import openai
 
-# Use the MINIMAL working model
-from minimal_sentence_model import setup_and_verify
+# web3, aiohttp, openai and the torch/ezkl model are imported lazily so the
+# socket is bound before any of them load - see warm_up()
+from verification_result import VerificationResult
 from config import Config
+from scheduler import ProofScheduler, SchedulerBusy, PRIORITY_CHAIN, PRIORITY_INTERACTIVE
+from feed import VerificationFeed, EVENTS, EVENT_SUBMITTED, EVENT_PROVEN, EVENT_FAILED, EVENT_REORGED
+from news_index import NewsIndex
+from signer_pool import SignerPool
+from job_leases import JobLeaseStore, LeaseLost, JOB_SETTLING
+from confirmations import ConfirmationQueue, to_hex, to_int
+from processed_events import ProcessedEvents
+from targets import load_targets, load_contract
+from ipfs_fetch import fetch_json_field, IPFSFetchError
+from prover_worker import ProverProcess
+from readiness import Readiness
+from batch_api import BatchVerifier, start_http_api
+from chain_reads import SharedRead, ArticleLookup, read_response
+from structured_logging import setup_logging, bind, dropped_records
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging - structured records written off the event loop
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Global variables
 server = None
 websocket_clients = set()
 setup_completed = False
-web3_instance = None
-contract = None
 event_listener_running = False
+scheduler = None
+feed = VerificationFeed()
+preflight = None
+prover = None
+processed_events = None
+targets = []  # ChainTarget per PolkaNews deployment, all sharing the scheduler and prover
+readiness = Readiness()
+background_tasks = set()
 
 
 class EventListener:
-    def __init__(self):
+    def __init__(self, target, signer_pool=None):
         self.logger = logging.getLogger(__name__)
+        self.target = target
         
         # Initialize Web3 HTTP connection for contract calls
-        self.web3 = Web3(Web3.HTTPProvider(Config.WEB3_HTTP_URI))
-        
-        # Load contract ABI
-        try:
-            with open(Config.CONTRACT_ABI_PATH, 'r') as f:
-                contract_abi = json.load(f)
-        except FileNotFoundError:
-            raise Exception(f"Contract ABI file not found: {Config.CONTRACT_ABI_PATH}")
-        except json.JSONDecodeError:
-            raise Exception(f"Invalid JSON in contract ABI file: {Config.CONTRACT_ABI_PATH}")
+        from web3 import Web3
+        self.web3 = Web3(Web3.HTTPProvider(target.http_uri))
         
         # Create contract instance
-        self.contract = self.web3.eth.contract(
-            address=Config.CONTRACT_ADDRESS,
-            abi=contract_abi
-        )
+        self.contract = load_contract(self.web3, target.contract_address, target.abi_path)
         
-        # Setup account for signing transactions
-        private_key = os.getenv('PRIVATE_KEY')
-        if not private_key:
-            raise ValueError("PRIVATE_KEY must be set in environment variables")
-        self.private_key = f"0x{private_key}" if not private_key.startswith('0x') else private_key
-        self.account = self.web3.eth.account.from_key(self.private_key)
-        self.logger.info(f"Event listener initialized with account: {self.account.address}")
-
-    async def submit_verification_result(self, request_id: int, content_hash: str, is_proof_verified: bool, binary_decision: bool, proof: bytes, instances: list) -> None:
-        """Submit verification result back to blockchain contract using submitVerificationResponse"""
+        # Setup verifier accounts for signing transactions - one nonce stream per account
+        # Targets on the same chain share each account's nonce stream, whichever endpoint they use
+        self.signers = signer_pool or SignerPool(self.web3, target.private_keys, chain_id=self.web3.eth.chain_id)
+        # Shared by every settlement within GAS_PRICE_TTL seconds
+        self.gas_price = SharedRead(lambda: self.web3.eth.gas_price, Config.GAS_PRICE_TTL)
+        self.logger.info(f"Event listener for {target.name} initialized with {len(self.signers)} verifier account(s)")
+
+    async def prepare_settlement(self):
+        """Gas price and signer nonces, fetched while the proof runs - returns the gas price"""
+        gas_price, _ = await asyncio.gather(self.gas_price.get(), self.signers.sync_nonces())
+        return gas_price
+
+    async def submit_verification_result(self, request_id: int, content_hash: str, result: VerificationResult,
+                                         gas_price=None, timeout=None):
+        """
+        Submit verification result back to blockchain contract using submitVerificationResponse - returns the receipt
+        timeout bounds the wait for the receipt and defaults to SETTLE_TIMEOUT
+        """
+        timeout = Config.SETTLE_TIMEOUT if timeout is None else timeout
         try:
+            if timeout <= 0:
+                raise asyncio.TimeoutError(f"No time left to settle request ID {request_id}")
             self.logger.info(f"Submitting verification response for request ID {request_id}")
             self.logger.info(f"Content Hash: {content_hash}")
-            self.logger.info(f"Is Proof Verified: {is_proof_verified}")
-            self.logger.info(f"Binary Decision: {binary_decision}")
-            self.logger.info(f"Raw proof type: {type(proof)}")
-            self.logger.info(f"Raw instances type: {type(instances)}")
+            self.logger.info(f"Is Proof Verified: {result.proof_verified}")
+            self.logger.info(f"Binary Decision: {bool(result.binary_decision)}")
+            self.logger.info(f"Proof length: {len(result.proof)}, public inputs: {len(result.instances)}")
 
-            nonce = self.web3.eth.get_transaction_count(self.account.address)
-            gas_price = self.web3.eth.gas_price
-            
-            # Convert proof to bytes if it's a hex string (like working example)
-            if isinstance(proof, str):
-                formatted_proof = bytes.fromhex(proof.replace('0x', ''))
-            elif isinstance(proof, bytes):
-                formatted_proof = proof
-            else:
-                self.logger.warning(f"Unknown proof format: {type(proof)}, using dummy proof")
-                formatted_proof = b'\x00' * 32
-            
-            # Handle pub_inputs - convert formatted string to integers like working example
-            if isinstance(instances, str):
-                try:
-                    parsed_instances = json.loads(instances.replace("'", '"'))
-                    formatted_instances = [int(x, 16) for x in parsed_instances]  # HEX TO INT like working example
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse string instances: {e}")
-                    formatted_instances = [0]
-            elif isinstance(instances, list):
-                formatted_instances = instances
-            else:
-                self.logger.warning(f"Unexpected instances type: {type(instances)}, using dummy")
-                formatted_instances = [0]
-            
-            self.logger.info(f"Formatted proof length: {len(formatted_proof)}")
-            self.logger.info(f"Formatted instances: {formatted_instances}")
-            
             # Create NewsVerificationResponse struct - CORRECT ORDER
             verification_response = (
                 request_id,           # uint256 requestId
                 content_hash,         # string contentHash
-                is_proof_verified,    # bool isProofVerified
-                binary_decision,      # bool binaryDecision
-                formatted_proof,      # bytes proof
-                formatted_instances   # uint256[] pubInputs
+                result.proof_verified,         # bool isProofVerified
+                bool(result.binary_decision),  # bool binaryDecision
+                result.proof,                  # bytes proof
+                result.instances               # uint256[] pubInputs
             )
+
+            # Run real proofs through the local verifier first - a rejected proof never reaches the network
+            min_gas = 0
+            if preflight is not None and result.proof_verified:
+                try:
+                    report = await preflight.check(verification_response)
+                except Exception as e:
+                    # The local EVM could not be set up - that says nothing about the proof
+                    self.logger.warning(f"⚠️ Pre-flight unavailable, relying on estimate_gas: {e}")
+                else:
+                    if not report.ok:
+                        raise ValueError(f"Proof rejected by local verifier: {report.error}")
+                    min_gas = report.expected_gas
+                    self.logger.info(f"Pre-flight passed - verifier gas {report.verifier_gas}, expected total {min_gas}")
+
+            # In fleet mode only the lease holder may send - the store moves each job to settled once
+            fleet = self.target.fleet
+            if fleet is not None and not await asyncio.to_thread(fleet.begin_settlement, request_id):
+                raise LeaseLost(f"Lease on request ID {request_id} is held by another node")
+
+            if gas_price is None:
+                gas_price = await self.gas_price.get()
             
-            try:
-                gas_estimate = self.contract.functions.submitVerificationResponse(
-                    verification_response
-                ).estimate_gas({'from': self.account.address})
-                self.logger.info(f"Estimated gas: {gas_estimate}")
-            except Exception as e:
-                self.logger.error(f"Gas estimation failed: {str(e)}")
-                raise ValueError(f"Transaction would fail: {str(e)}")
-            
-            tx = self.contract.functions.submitVerificationResponse(
-                verification_response
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': gas_estimate + 100000,
-                'gasPrice': gas_price,
-                'nonce': nonce,
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            self.logger.info(f"Transaction sent: {tx_hash.hex()}")
-            
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
-            if receipt['status'] == 0:
-                self.logger.error("Transaction reverted")
-                raise Exception("Transaction reverted")
+            async with self.signers.acquire() as slot:
+                account = slot.account
+                submit_call = self.contract.functions.submitVerificationResponse(verification_response)
+                # Every RPC below blocks - run them in threads so other jobs and clients keep moving
+                try:
+                    gas_estimate = await asyncio.to_thread(submit_call.estimate_gas, {'from': account.address})
+                    self.logger.info(f"Estimated gas: {gas_estimate}")
+                except Exception as e:
+                    self.logger.error(f"Gas estimation failed: {str(e)}")
+                    raise ValueError(f"Transaction would fail: {str(e)}")
+                # The node knows the contract state; the pre-flight figure only guards against an underestimate
+                gas_limit = max(gas_estimate + 100000, min_gas)
+                
+                # Taken only now - a failed estimate above leaves no gap in this account's nonces
+                nonce = await slot.take_nonce()
+                tx = await asyncio.to_thread(submit_call.build_transaction, {
+                    'from': account.address,
+                    'gas': gas_limit,
+                    'gasPrice': gas_price,
+                    'nonce': nonce,
+                })
+                
+                signed_tx = self.web3.eth.account.sign_transaction(tx, account.key)
+                tx_hash = await asyncio.to_thread(self.web3.eth.send_raw_transaction, signed_tx.raw_transaction)
+                self.logger.info(f"Transaction sent from {account.address} (nonce {nonce}): {tx_hash.hex()}")
+                
+                # Wait off the event loop so other accounts keep settling meanwhile
+                receipt = await asyncio.to_thread(
+                    self.web3.eth.wait_for_transaction_receipt, tx_hash, timeout=timeout
+                )
+                if receipt['status'] == 0:
+                    self.logger.error("Transaction reverted")
+                    raise Exception("Transaction reverted")
                 
             self.logger.info(f"✅ Verification response submitted successfully in block {receipt['blockNumber']}")
+            if fleet is not None:
+                await asyncio.to_thread(fleet.mark_settled, request_id, tx_hash.hex())
+            return receipt
             
         except Exception as e:
             self.logger.error(f"Error submitting verification response: {str(e)}")
             raise
 
 
-async def process_news_event(event_data, contract, web3_instance):
-    """Process NewsSubmitted events - fetch content, verify, submit result"""
+def remaining(deadline):
+    """Seconds left until a loop-time deadline"""
+    return deadline - asyncio.get_running_loop().time()
+
+
+async def run_prover(claim, evidence, timeout):
+    """Prove one claim within timeout - in the recyclable worker process unless isolation is off"""
+    if timeout <= 0:
+        raise asyncio.TimeoutError("Job deadline passed before proving started")
+    if prover is not None:
+        return await prover.verify(claim, evidence, timeout)
+    from minimal_sentence_model import setup_and_verify
+    return await asyncio.wait_for(setup_and_verify(claim, evidence, setup_required=False), timeout)
+
+
+async def fetch_claim(content_hash, timeout=None):
+    """Claim text of a submission from IPFS via the Pinata gateway"""
+    import aiohttp
+    pinata_url = f"https://gateway.pinata.cloud/ipfs/{content_hash}"
+    logger.info(f"☁️ Fetching content from {pinata_url}")
+    # Streamed with a hard byte cap - stops reading once "content" is complete
+    client_timeout = aiohttp.ClientTimeout(total=timeout if timeout is not None else Config.IPFS_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=client_timeout) as session:
+        return await fetch_json_field(session, pinata_url, "content")
+
+
+def get_event_listener(target):
+    """Per-target EventListener - built once so every settlement draws from the same signer pool"""
+    if target.listener is None:
+        target.listener = EventListener(target)
+    return target.listener
+
+
+# Sources registry read by every chain job
+SOURCES_CONTRACT_ADDRESS = "0x128fbb7b33BdC6591EB941977a5004ee6c24b16B"
+SOURCES_RPC_URL = "https://rpc.api.moonbase.moonbeam.network"
+SOURCES_ABI = [
+    {
+        "inputs": [],
+        "name": "getActiveSources",
+        "outputs": [{"internalType": "string[]", "name": "", "type": "string[]"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+_sources_contract = None
+
+
+def load_active_sources():
+    """getActiveSources() on the sources contract - blocking, run it in a thread"""
+    global _sources_contract
+    if _sources_contract is None:
+        from web3 import Web3
+        sources_web3 = Web3(Web3.HTTPProvider(SOURCES_RPC_URL))
+        _sources_contract = sources_web3.eth.contract(address=SOURCES_CONTRACT_ADDRESS, abi=SOURCES_ABI)
+    return _sources_contract.functions.getActiveSources().call()
+
+
+# One read serves every event arriving within SOURCES_CACHE_SECONDS
+active_sources = SharedRead(load_active_sources, Config.SOURCES_CACHE_SECONDS)
+
+
+def decode_content_hash(target, tx_hash):
+    """contentHash argument of the submitNews transaction - blocking, run it in a thread"""
+    # Get the transaction to find the IPFS hash (like in script.js)
+    tx = target.web3.eth.get_transaction(tx_hash)
+    
+    # Use contract.decode_function_input like in the JavaScript version
+    function_obj, function_inputs = target.contract.decode_function_input(tx.input)
+    
+    # Extract the IPFS hash from the function arguments (first argument)
+    content_hash = function_inputs.get('contentHash', '')
+    if not content_hash:
+        # Try alternative key names
+        content_hash = function_inputs.get('_contentHash', '')
+        if not content_hash and len(function_inputs) > 0:
+            # Get first argument value if key names don't match
+            content_hash = list(function_inputs.values())[0]
+    return content_hash
+
+
+async def resolve_article(target, request_id, tx_hash):
+    """
+    (contentHash, timestamp) of a submission. contentHash is an indexed string,
+    so the log only carries its hash - read it from the local index or a
+    batched getNewsArticles call, and only decode the transaction as a last resort.
+    """
+    if target.news_index is not None:
+        row = target.news_index.get(request_id)
+        if row and row["content_hash"]:
+            return row["content_hash"], row["timestamp"]
+    
+    if target.articles is not None:
+        try:
+            article = await target.articles.get(request_id)
+            if article is not None and article.content_hash:
+                return article.content_hash, article.timestamp
+        except Exception as e:
+            logger.warning(f"⚠️ getNewsArticles lookup failed, decoding the transaction instead: {e}")
+    
+    logger.info(f"🔍 Getting transaction details for hash: {tx_hash}")
+    content_hash = await asyncio.to_thread(decode_content_hash, target, tx_hash)
+    logger.info(f"📰 Extracted contentHash from transaction: {content_hash}")
+    return content_hash, None
+
+
+async def gather_evidence(claim, sources_task, deadline):
+    """Evidence about the claim from the active news sources, via OpenAI web search"""
+    try:
+        sources = await sources_task
+        logger.info(f"📡 Active sources retrieved: {sources}")
+    except Exception as sources_error:
+        logger.error(f"❌ Failed to get active sources: {sources_error}")
+        return "this is evidence"  # fallback to original
+    
+    if not (sources and claim):
+        return "No active sources available"
+    
+    try:
+        # Set up OpenAI (you'll need to set OPENAI_API_KEY environment variable)
+        openai_api_key = os.getenv('OPENAI_API_KEY')
+        if not openai_api_key:
+            logger.warning("⚠️ OPENAI_API_KEY not set, using fallback evidence")
+            return f"Active news sources: {', '.join(sources)}"
+        
+        # Create OpenAI client
+        import openai
+        client = openai.OpenAI(api_key=openai_api_key, timeout=Config.EVIDENCE_TIMEOUT)
+        
+        # Prepare the input for OpenAI
+        openai_input = {
+            "news": claim,
+            "sources": sources
+        }
+        
+        logger.info(f"🤖 Calling OpenAI with news: '{claim[:100]}...' and sources: {sources}")
+        
+        # Call OpenAI API - in a thread so a stalled call cannot hold the event loop
+        response = await asyncio.wait_for(asyncio.to_thread(
+            client.responses.create,
+
+            model="gpt-4.1",
+
+            tools=[{ "type": "web_search_preview" }],
+
+            input= "You are a research assistant. I will give you a news claim and a list of trusted news sources. "
+                        "Your task is to search for and extract relevant evidence about the claim *only from the provided sources*. "
+                        "Summarize any supporting or contradicting information found in the articles. Do not have any links in the middle.\n\n"
+                        # "If no relevant information is found from the listed sources, write: "
+                        # "\"No relevant information found on the provided sources.\"\n\n"
+                        "Return your answer strictly in the following JSON format:\n\n"
+                        "{\n  \"news\": \"<the original news claim>\",\n  \"evidence\": \"<summary of the evidence from the listed sources>\"\n}\n\n"
+                        f"Here is the input:\n\n{json.dumps(openai_input)}"
+
+        ), min(Config.EVIDENCE_TIMEOUT, max(remaining(deadline), 0)))
+       
+        openai_response = response.output_text
+        logger.debug("🤖 OpenAI response: %s", openai_response)
+        
+        try:
+            # Parse JSON response from OpenAI - handle markdown code blocks
+            openai_response_clean = openai_response.strip()
+            if openai_response_clean.startswith('```json'):
+                # Remove markdown code blocks
+                openai_response_clean = openai_response_clean.replace('```json', '').replace('```', '').strip()
+            
+            parsed_response = json.loads(openai_response_clean)
+            evidence = parsed_response.get("evidence", "No evidence found")
+            logger.debug("📰 Extracted evidence: %r", evidence)
+            return evidence
+        except json.JSONDecodeError:
+            logger.error("❌ Failed to parse OpenAI JSON response")
+            return openai_response  # Use raw response as fallback
+            
+    except Exception as openai_error:
+        logger.error(f"❌ OpenAI API call failed: {openai_error}")
+        return f"Active news sources: {', '.join(sources)}"  # fallback
+
+
+async def process_news_event(event_data, target):
+    """
+    Process NewsSubmitted events - fetch content, verify, submit result.
+
+    Stages run as soon as their inputs are ready: the sources read starts
+    with the event, IPFS waits only for the contentHash, and gas price and
+    nonces are fetched while the proof runs. The critical path is
+    IPFS -> evidence -> prove -> send. The news index is written by
+    index_submission() when the log arrives, on every node.
+    """
     global setup_completed
+    contract = target.contract
+    # Overall budget for this job - every stage below gets at most what is left of it
+    deadline = asyncio.get_running_loop().time() + Config.JOB_DEADLINE
+    
+    # Independent of the article - runs alongside the contentHash lookup and the IPFS fetch
+    sources_task = asyncio.create_task(active_sources.get())
+    settle_task = None
     
     try:
         if 'params' in event_data and 'result' in event_data['params']:
@@ -157,161 +375,45 @@ async def process_news_event(event_data, contract, web3_instance):
             
             # Get the transaction hash from the log
             tx_hash = log_data.get('transactionHash')
+            bind(request_id=request_id, target=target.name, tx_hash=tx_hash)
             if not tx_hash:
                 logger.error("❌ No transaction hash in event data")
                 return
-                
-            logger.info(f"🔍 Getting transaction details for hash: {tx_hash}")
             
-            # Get transaction details to extract the actual contentHash parameter
             try:
-                # Get the transaction to find the IPFS hash (like in script.js)
-                tx = web3_instance.eth.get_transaction(tx_hash)
-                
-                # Decode the transaction input to get the actual contentHash parameter
-                try:
-                    # Use contract.decode_function_input like in the JavaScript version
-                    decoded_input = contract.decode_function_input(tx.input)
-                    function_obj, function_inputs = decoded_input
-                    
-                    # Extract the IPFS hash from the function arguments (first argument)
-                    content_hash = function_inputs.get('contentHash', '')
-                    if not content_hash:
-                        # Try alternative key names
-                        content_hash = function_inputs.get('_contentHash', '')
-                        if not content_hash and len(function_inputs) > 0:
-                            # Get first argument value if key names don't match
-                            content_hash = list(function_inputs.values())[0]
-                    
-                    logger.info(f"📰 Extracted contentHash from transaction: {content_hash}")
-                        
-                except Exception as decode_error:
-                    logger.error(f"❌ Failed to decode transaction input: {decode_error}")
-                    return
-                    
-            except Exception as tx_error:
-                logger.error(f"❌ Failed to get transaction: {tx_error}")
+                content_hash, _ = await resolve_article(target, request_id, tx_hash)
+            except Exception as lookup_error:
+                logger.error(f"❌ Failed to resolve contentHash: {lookup_error}")
                 return
 
             if not content_hash:
                 logger.error("❌ Could not extract contentHash from transaction")
                 return
 
+            bind(content_hash=content_hash)
             logger.info(f"📰 NewsSubmitted event received for content hash: {content_hash}")
-
+            feed.publish(EVENT_SUBMITTED, request_id, content_hash, target=target.name)
+            
             # 1. Fetch content from IPFS via Pinata gateway
-            pinata_url = f"https://gateway.pinata.cloud/ipfs/{content_hash}"
-            logger.info(f"☁️ Fetching content from {pinata_url}")
+            ipfs_task = asyncio.create_task(
+                fetch_claim(content_hash, min(Config.IPFS_TIMEOUT, remaining(deadline)))
+            )
+            
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(pinata_url) as response:
-                        print(response)
-                        if response.status == 200:
-                            ipfs_data = await response.json()
-                            claim = ipfs_data.get("content")
-                            logger.info(f"📄 Claim content fetched: '{claim[:100]}...'")
-                        else:
-                            error_msg = f"Failed to fetch from Pinata for {content_hash}: HTTP {response.status}"
-                            logger.error(f"❌ {error_msg}")
-                            return
+                claim = await ipfs_task
+                logger.info(f"📄 Claim content fetched: '{claim[:100]}...'")
+            except IPFSFetchError as e:
+                error_msg = f"Failed to fetch from Pinata for {content_hash}: {e}"
+                logger.error(f"❌ {error_msg}")
+                return
             except Exception as e:
                 error_msg = f"Error fetching/parsing from Pinata for {content_hash}: {e}"
                 logger.error(f"❌ {error_msg}", exc_info=True)
                 return
 
             # 2. Get active sources from sources contract and use OpenAI to get evidence
-            sources_contract_address = "0x128fbb7b33BdC6591EB941977a5004ee6c24b16B"
-            sources_rpc_url = "https://rpc.api.moonbase.moonbeam.network"
-            
-            # Create Web3 instance for sources contract
-            sources_web3 = Web3(Web3.HTTPProvider(sources_rpc_url))
-            
-            # Simple ABI for getActiveSources function
-            sources_abi = [
-                {
-                    "inputs": [],
-                    "name": "getActiveSources",
-                    "outputs": [{"internalType": "string[]", "name": "", "type": "string[]"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                }
-            ]
-            
-            try:
-                sources_contract = sources_web3.eth.contract(
-                    address=sources_contract_address,
-                    abi=sources_abi
-                )
-                
-                active_sources = sources_contract.functions.getActiveSources().call()
-                logger.info(f"📡 Active sources retrieved: {active_sources}")
-                
-                # Use OpenAI to get evidence from active sources
-                if active_sources and claim:
-                    try:
-                        # Set up OpenAI (you'll need to set OPENAI_API_KEY environment variable)
-                        openai_api_key = os.getenv('OPENAI_API_KEY')
-                        if not openai_api_key:
-                            logger.warning("⚠️ OPENAI_API_KEY not set, using fallback evidence")
-                            evidence = f"Active news sources: {', '.join(active_sources)}"
-                        else:
-                            # Create OpenAI client
-                            client = openai.OpenAI(api_key=openai_api_key)
-                            
-                            # Prepare the input for OpenAI
-                            openai_input = {
-                                "news": claim,
-                                "sources": active_sources
-                            }
-                            
-                            logger.info(f"🤖 Calling OpenAI with news: '{claim[:100]}...' and sources: {active_sources}")
-                            
-                            # Call OpenAI API
-                            response = client.responses.create(
-
-                                model="gpt-4.1",
-
-                                tools=[{ "type": "web_search_preview" }],
-
-                                input= "You are a research assistant. I will give you a news claim and a list of trusted news sources. "
-                                            "Your task is to search for and extract relevant evidence about the claim *only from the provided sources*. "
-                                            "Summarize any supporting or contradicting information found in the articles. Do not have any links in the middle.\n\n"
-                                            # "If no relevant information is found from the listed sources, write: "
-                                            # "\"No relevant information found on the provided sources.\"\n\n"
-                                            "Return your answer strictly in the following JSON format:\n\n"
-                                            "{\n  \"news\": \"<the original news claim>\",\n  \"evidence\": \"<summary of the evidence from the listed sources>\"\n}\n\n"
-                                            f"Here is the input:\n\n{json.dumps(openai_input)}"
-
-                            )
-                           
-                            openai_response = response.output_text
-                            logger.info(f"🤖 OpenAI response: {openai_response}")
-                            
-                            try:
-                                # Parse JSON response from OpenAI - handle markdown code blocks
-                                openai_response_clean = openai_response.strip()
-                                if openai_response_clean.startswith('```json'):
-                                    # Remove markdown code blocks
-                                    openai_response_clean = openai_response_clean.replace('```json', '').replace('```', '').strip()
-                                
-                                parsed_response = json.loads(openai_response_clean)
-                                evidence = parsed_response.get("evidence", "No evidence found")
-                                logger.info(f"📰 Extracted evidence: '{evidence}'")
-                            except json.JSONDecodeError:
-                                logger.error("❌ Failed to parse OpenAI JSON response")
-                                evidence = openai_response  # Use raw response as fallback
-                                
-                    except Exception as openai_error:
-                        logger.error(f"❌ OpenAI API call failed: {openai_error}")
-                        evidence = f"Active news sources: {', '.join(active_sources)}"  # fallback
-                else:
-                    evidence = "No active sources available"
-                    
-            except Exception as sources_error:
-                logger.error(f"❌ Failed to get active sources: {sources_error}")
-                evidence = "this is evidence"  # fallback to original
-                
-            logger.info(f"📰 Final evidence for verification: '{evidence}...'")
+            evidence = await gather_evidence(claim, sources_task, deadline)
+            logger.info(f"📰 Final evidence for verification: '{evidence[:100]}...'")
 
             # 3. Prepare for verification
             if not claim:
@@ -320,12 +422,16 @@ async def process_news_event(event_data, contract, web3_instance):
                 return
 
             # 3. Call ZKML verification
-            print(claim, evidence)
+            logger.debug("🧾 Proving claim %r with evidence %r", claim, evidence)
+            event_listener = get_event_listener(target)
+            # Gas price and nonces are ready by the time the proof is
+            settle_task = asyncio.create_task(event_listener.prepare_settlement())
             try:
-                result = await setup_and_verify(
-                    claim,
-                    evidence,
-                    setup_required=False
+                # Chain jobs are always admitted and jump ahead of interactive requests.
+                # The proving deadline is fixed when the job starts, not while it waits in the queue.
+                result = await scheduler.submit(
+                    PRIORITY_CHAIN,
+                    lambda: run_prover(claim, evidence, min(Config.PROVE_TIMEOUT, remaining(deadline)))
                 )
                 
                 if not setup_completed:
@@ -333,34 +439,48 @@ async def process_news_event(event_data, contract, web3_instance):
                     logger.info("✅ Circuit setup completed")
 
                 logger.info(f"✅ ZKML verification complete for {content_hash}")
-                logger.info(f"Binary Decision: {result.get('binary_decision')}")
-                logger.info(f"Proof Verified: {result.get('proof_verified')}")
-
-                # 4. Submit verification result back to blockchain
-                event_listener = EventListener()
-                await event_listener.submit_verification_result(
-                    request_id,
-                    content_hash,
-                    result.get('proof_verified', False),  # is_proof_verified
-                    bool(result.get('binary_decision', 0)),  # binary_decision
-                    result.get('proof', {}),  # Pass the raw proof dict from EZKL
-                    result.get('pub_inputs', [])  # Pass formatted pub_inputs string
+                logger.info(f"Binary Decision: {result.binary_decision}")
+                logger.info(f"Proof Verified: {result.proof_verified}")
+                feed.publish(
+                    EVENT_PROVEN, request_id, content_hash, target=target.name,
+                    binaryDecision=bool(result.binary_decision),
+                    proofVerified=result.proof_verified
+                )
+
+                # 4. Submit verification result back to blockchain - within the job deadline
+                receipt = await event_listener.submit_verification_result(
+                    request_id, content_hash, result, gas_price=await settled_gas_price(settle_task),
+                    timeout=min(Config.SETTLE_TIMEOUT, remaining(deadline))
+                )
+                feed.publish_settled(
+                    target.name, request_id, content_hash,
+                    isVerified=bool(result.binary_decision),
+                    txHash=receipt['transactionHash'].hex(),
+                    blockNumber=receipt['blockNumber']
                 )
 
+            except LeaseLost as e:
+                logger.warning(f"⏭️ {e} - not submitting")
             except Exception as e:
                 error_msg = f"ZKML verification failed for {content_hash}: {str(e)}"
                 logger.error(f"❌ {error_msg}", exc_info=True)
                 
-                # Submit failed verification result
+                feed.publish(EVENT_FAILED, request_id, content_hash, target=target.name, error=str(e)[:200])
+                
+                # Submit failed verification result - given a full SETTLE_TIMEOUT past the
+                # deadline, so a job that ran out of time still settles as failed
                 try:
-                    event_listener = EventListener()
-                    await event_listener.submit_verification_result(
+                    receipt = await event_listener.submit_verification_result(
                         request_id,
                         content_hash,
-                        False,  # is_proof_verified = False
-                        False,  # binary_decision = False
-                        b'\x00' * 32,  # dummy bytes proof (not empty dict)
-                        [0]      # dummy uint256[] instances (not empty list)
+                        VerificationResult.failed(),  # dummy proof and instances, both flags False
+                        gas_price=await settled_gas_price(settle_task)
+                    )
+                    feed.publish_settled(
+                        target.name, request_id, content_hash,
+                        isVerified=False,
+                        txHash=receipt['transactionHash'].hex(),
+                        blockNumber=receipt['blockNumber']
                     )
                 except Exception as submit_error:
                     logger.error(f"❌ Failed to submit error result: {submit_error}")
@@ -369,37 +489,295 @@ async def process_news_event(event_data, contract, web3_instance):
         
     except Exception as e:
         logger.error(f"❌ Error in process_news_event: {e}", exc_info=True)
+    finally:
+        sources_task.cancel()
+        if settle_task is not None:
+            settle_task.cancel()
+
+
+async def settled_gas_price(settle_task):
+    """Gas price prefetched during proving - None lets the submitter fetch it itself"""
+    try:
+        return await settle_task
+    except Exception as e:
+        logger.warning(f"⚠️ Settlement prefetch failed: {e}")
+        return None
+
+
+async def index_submission(target, log_data):
+    """
+    Record a NewsSubmitted log in the local news index. Runs for every log
+    on every node - in fleet mode the lease winner is not the only one serving
+    queries for the article.
+    """
+    news_index = target.news_index
+    if news_index is None:
+        return
+    try:
+        decoded_event = target.contract.events.NewsSubmitted().process_log(log_data)
+        request_id = decoded_event['args']['requestId']
+        tx_hash = log_data.get('transactionHash')
+        content_hash, timestamp = await resolve_article(target, request_id, tx_hash)
+        if not content_hash:
+            return
+        
+        block_number = decoded_event['blockNumber']
+        if isinstance(block_number, str):
+            block_number = int(block_number, 16)  # raw subscription logs carry hex quantities
+        if timestamp is None:
+            try:
+                block = await asyncio.to_thread(target.web3.eth.get_block, block_number)
+                timestamp = block['timestamp']
+            except Exception as block_error:
+                logger.warning(f"⚠️ Could not fetch block timestamp, using local time: {block_error}")
+        news_index.record_submitted(
+            request_id,
+            content_hash,
+            decoded_event['args']['reporter'],
+            timestamp,
+            block_number,
+            tx_hash
+        )
+    except Exception as e:
+        logger.error(f"❌ Could not index NewsSubmitted log: {e}")
+
+
+async def process_verified_event(event_data, target):
+    """Record NewsVerified outcomes in the local news index and announce them on the feed"""
+    contract, news_index, fleet = target.contract, target.news_index, target.fleet
+    try:
+        log_data = event_data['params']['result']
+        decoded_event = contract.events.NewsVerified().process_log(log_data)
+        request_id = decoded_event['args']['requestId']
+        is_verified = decoded_event['args']['isVerified']
+        if log_data.get('removed'):
+            logger.warning(f"♻️ NewsVerified log for request ID {request_id} removed by reorg")
+            if news_index is not None:
+                news_index.reset_status(request_id)
+            feed.forget_settled(target.name, request_id)
+            return
+        
+        logger.info(f"🧾 NewsVerified event for request ID {request_id}: {is_verified}")
+        article = None
+        if news_index is not None:
+            news_index.record_verified(request_id, is_verified, log_data.get('transactionHash'))
+            article = news_index.get(request_id)
+        # Subscribers hear about settlements this node did not send itself - a peer's
+        # in fleet mode, or our own from before a restart
+        feed.publish_settled(
+            target.name, request_id, article and article['content_hash'],
+            isVerified=bool(is_verified),
+            txHash=log_data.get('transactionHash'),
+            blockNumber=to_int(log_data['blockNumber']) if log_data.get('blockNumber') is not None else None
+        )
+        if fleet is not None:
+            await asyncio.to_thread(fleet.mark_settled, request_id, log_data.get('transactionHash'))
+    except Exception as e:
+        logger.error(f"❌ Error in process_verified_event: {e}", exc_info=True)
+
+
+async def renew_lease(fleet, request_id):
+    """Keep our fleet lease alive while the job is being proven and settled"""
+    while True:
+        await asyncio.sleep(fleet.lease_seconds / 3)
+        if not await asyncio.to_thread(fleet.renew, request_id):
+            logger.warning(f"⚠️ Lost lease on request ID {request_id}")
+            return
 
 
-async def start_blockchain_monitoring():
-    """Start blockchain event monitoring - runs in background"""
-    global web3_instance, contract
+async def process_claimed_news_event(event_data, target):
+    """Fleet mode wrapper - only process NewsSubmitted events this node holds the lease for"""
+    fleet = target.fleet
+    if fleet is None:
+        await process_news_event(event_data, target)
+        return
     
-    logger.info("🔗 Initializing blockchain event monitoring...")
-    logger.info("🔗 Connecting to blockchain...")
-    logger.info(f"📡 HTTP URI: {Config.WEB3_HTTP_URI}")
-    logger.info(f"📡 WebSocket URI: {Config.WEB3_WS_URI}")
-    logger.info(f"📋 Contract Address: {Config.CONTRACT_ADDRESS}")
+    try:
+        log_data = event_data['params']['result']
+        request_id = target.contract.events.NewsSubmitted().process_log(log_data)['args']['requestId']
+    except Exception as e:
+        logger.error(f"❌ Could not decode NewsSubmitted event: {e}")
+        return
     
-    # Initialize Web3 HTTP connection
-    web3_instance = Web3(Web3.HTTPProvider(Config.WEB3_HTTP_URI))
-    logger.info("✅ Blockchain HTTP connection established")
+    # A busy node waits a little before claiming so idle peers win the job
+    await asyncio.sleep(min(scheduler.queue_length() * Config.FLEET_CLAIM_BACKOFF, fleet.lease_seconds / 2))
+    if not await asyncio.to_thread(fleet.claim, request_id, json.dumps(event_data)):
+        logger.info(f"⏭️ Request ID {request_id} is owned by another node")
+        return
     
-    # Load contract ABI
+    logger.info(f"📌 Claimed request ID {request_id} as {fleet.node_id}")
+    lease_task = asyncio.create_task(renew_lease(fleet, request_id))
     try:
-        with open(Config.CONTRACT_ABI_PATH, 'r') as f:
-            contract_abi = json.load(f)
-    except FileNotFoundError:
-        raise Exception(f"Contract ABI file not found: {Config.CONTRACT_ABI_PATH}")
-    except json.JSONDecodeError:
-        raise Exception(f"Invalid JSON in contract ABI file: {Config.CONTRACT_ABI_PATH}")
-    
-    # Create contract instance
-    contract = web3_instance.eth.contract(
-        address=Config.CONTRACT_ADDRESS,
-        abi=contract_abi
-    )
+        await process_news_event(event_data, target)
+    finally:
+        lease_task.cancel()
+        # Not settled - let a peer retry straight away instead of waiting for expiry
+        if not await asyncio.to_thread(fleet.is_settled, request_id):
+            await asyncio.to_thread(fleet.release, request_id)
+
+
+async def sweep_expired_leases(target):
+    """Take over jobs from fleet peers that stopped renewing their leases"""
+    fleet = target.fleet
+    while True:
+        await asyncio.sleep(Config.FLEET_SWEEP_INTERVAL)
+        if target.contract is None:
+            continue
+        try:
+            for job in await asyncio.to_thread(fleet.expired_jobs):
+                # The previous owner may have died after its transaction was mined
+                if job.status == JOB_SETTLING:
+                    if await asyncio.to_thread(read_response, target.contract, job.request_id) is not None:
+                        await asyncio.to_thread(fleet.mark_settled, job.request_id)
+                        continue
+                if not job.event_json:
+                    continue
+                logger.info(f"🔁 Taking over expired job for request ID {job.request_id}")
+                task = asyncio.create_task(
+                    process_claimed_news_event(json.loads(job.event_json), target)
+                )
+                background_tasks.add(task)
+                task.add_done_callback(background_tasks.discard)
+        except Exception as e:
+            logger.error(f"❌ Lease sweep failed: {e}")
+
+
+async def handle_submitted_log(event_data, target):
+    """Route a NewsSubmitted log through reorg handling, confirmations and the idempotency index"""
+    log_data = event_data['params']['result']
+    request_id = target.contract.events.NewsSubmitted().process_log(log_data)['args']['requestId']
+    tx_hash = to_hex(log_data.get('transactionHash', ''))
+    key = (request_id, tx_hash)
+    
+    if log_data.get('removed'):
+        handle_removed_submission(target, key)
+        return
+    
+    if key in target.confirmations or processed_events.seen(request_id, tx_hash):
+        logger.info(f"⏭️ Duplicate NewsSubmitted log for request ID {request_id} - ignoring")
+        return
+    
+    # Indexed here rather than by the job, so peers' articles are indexed too
+    index_task = asyncio.create_task(index_submission(target, log_data))
+    background_tasks.add(index_task)
+    index_task.add_done_callback(background_tasks.discard)
+    
+    await target.confirmations.add(key, log_data['blockNumber'], log_data['blockHash'], event_data)
+
+
+def handle_removed_submission(target, key):
+    """A reorg removed a NewsSubmitted log - cancel the job and roll back its local state"""
+    request_id, tx_hash = key
+    logger.warning(f"♻️ NewsSubmitted log for request ID {request_id} on {target.name} removed by reorg")
+    
+    target.confirmations.discard(key)
+    task = target.job_tasks.pop(key, None)
+    if task is not None:
+        task.cancel()
+    processed_events.cancel(request_id, tx_hash)
+    if target.news_index is not None:
+        target.news_index.remove(request_id)
+    feed.publish(EVENT_REORGED, request_id, target=target.name)
+
+
+async def dispatch_confirmed_submission(target, key, event_data):
+    """Start proving a confirmed log - exactly once per (requestId, transactionHash)"""
+    request_id, tx_hash = key
+    if not processed_events.begin(request_id, tx_hash):
+        logger.info(f"⏭️ Request ID {request_id} already processed - skipping")
+        return
+    
+    logger.info("🎉 Detected NewsSubmitted event, processing...")
+    # Run as a task so the scheduler, not arrival order, decides what is proven next
+    task = asyncio.create_task(run_submission(target, key, event_data))
+    target.job_tasks[key] = task
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+async def run_submission(target, key, event_data):
+    finished = False
+    try:
+        # A retried log may have been settled before the previous attempt died
+        try:
+            settled = await asyncio.to_thread(read_response, target.contract, key[0]) is not None
+        except Exception as e:
+            logger.warning(f"⚠️ Could not check for an existing response: {e}")
+            settled = False
+        if settled:
+            logger.info(f"⏭️ Request ID {key[0]} already has a response on-chain - skipping")
+        else:
+            await process_claimed_news_event(event_data, target)
+        processed_events.finish(*key)
+        finished = True
+    except asyncio.CancelledError:
+        logger.info(f"🛑 Cancelled job for request ID {key[0]}")
+        raise
+    finally:
+        if not finished:
+            # Retried when the log is delivered again - a reorg cancel stays cancelled
+            processed_events.fail(*key)
+        target.job_tasks.pop(key, None)
+
+
+async def rescan_submissions(target, news_submitted_topic):
+    """
+    Feed the last CONFIRMATION_RESCAN_BLOCKS of NewsSubmitted logs through
+    handle_submitted_log after every (re)subscription. Logs still waiting for
+    confirmations when the process stopped, and logs sent while the socket
+    was down, are picked up again; the idempotency index skips the rest.
+    """
+    head = await asyncio.to_thread(lambda: target.web3.eth.block_number)
+    log_filter = {
+        "address": target.contract_address.lower(),
+        "topics": [news_submitted_topic],
+        "fromBlock": hex(max(head - Config.CONFIRMATION_RESCAN_BLOCKS, 0)),
+        "toBlock": hex(head),
+    }
+    # Raw RPC so the logs have the same shape as subscription notifications
+    response = await asyncio.to_thread(target.web3.provider.make_request, "eth_getLogs", [log_filter])
+    if response.get("error"):
+        raise Exception(f"eth_getLogs error: {response['error']}")
+    
+    for log_data in response.get("result") or []:
+        await handle_submitted_log({"params": {"result": log_data}}, target)
+    logger.info(f"🔎 Rescanned {Config.CONFIRMATION_RESCAN_BLOCKS} block(s) for missed NewsSubmitted logs")
+
+
+async def backfill_news_index(target):
+    """Fill index gaps and refresh pending statuses - run after every (re)subscription"""
+    if target.news_index is None:
+        return
+    try:
+        await asyncio.to_thread(target.news_index.backfill, target.contract)
+        logger.info(f"🗃️ News index for {target.name} is up to date")
+    except Exception as e:
+        logger.error(f"❌ News index backfill failed: {e}")
+
+
+async def start_blockchain_monitoring(target):
+    """Start blockchain event monitoring for one target - runs in background"""
+    logger.info(f"🔗 Initializing blockchain event monitoring for {target.name}...")
+    logger.info("🔗 Connecting to blockchain...")
+    logger.info(f"📡 HTTP URI: {target.http_uri}")
+    logger.info(f"📡 WebSocket URI: {target.ws_uri}")
+    logger.info(f"📋 Contract Address: {target.contract_address}")
+    
+    # Initialize Web3 HTTP connection and contract instance
+    target.connect()
+    contract = target.contract
+    target.articles = ArticleLookup(contract)
+    logger.info("✅ Blockchain HTTP connection established")
     logger.info("📋 Contract instance created")
+    
+    # NewsSubmitted logs wait here until they are CONFIRMATION_DEPTH blocks deep
+    async def on_confirmed(key, event_data):
+        await dispatch_confirmed_submission(target, key, event_data)
+    
+    target.confirmations = ConfirmationQueue(target.web3, on_confirmed)
+    target.confirmations.start()
+    logger.info(f"⏳ Confirmation depth: {target.confirmations.depth} block(s)")
+    
     logger.info("🎯 Ready for real-time NewsSubmitted events!")
     
     logger.info("🔄 Real-time blockchain event monitoring started")
@@ -408,11 +786,12 @@ async def start_blockchain_monitoring():
     # Start WebSocket monitoring
     while True:
         try:
-            async with connect(Config.WEB3_WS_URI) as ws:
+            async with connect(target.ws_uri) as ws:
                 logger.info("🔗 Connected to blockchain WebSocket")
                 
-                # Get NewsSubmitted event topic hash
+                # Get NewsSubmitted / NewsVerified event topic hashes
                 news_submitted_topic = contract.events.NewsSubmitted().build_filter().topics[0]
+                news_verified_topic = contract.events.NewsVerified().build_filter().topics[0]
                 
                 subscribe_msg = {
                     "jsonrpc": "2.0",
@@ -421,8 +800,8 @@ async def start_blockchain_monitoring():
                     "params": [
                         "logs",
                         {
-                            "address": Config.CONTRACT_ADDRESS.lower(),
-                            "topics": [news_submitted_topic]
+                            "address": target.contract_address.lower(),
+                            "topics": [[news_submitted_topic, news_verified_topic]]
                         }
                     ]
                 }
@@ -439,7 +818,18 @@ async def start_blockchain_monitoring():
                 if not subscription_id:
                     raise Exception("No subscription ID received")
                     
-                logger.info(f"✅ Successfully subscribed to NewsSubmitted events with ID: {subscription_id}")
+                logger.info(f"✅ Successfully subscribed to NewsSubmitted/NewsVerified events with ID: {subscription_id}")
+                
+                # Catch the news index up with anything missed while we were down or disconnected
+                backfill_task = asyncio.create_task(backfill_news_index(target))
+                background_tasks.add(backfill_task)
+                backfill_task.add_done_callback(background_tasks.discard)
+                
+                # Pick up logs that were pending confirmation or sent while we were away
+                try:
+                    await rescan_submissions(target, news_submitted_topic)
+                except Exception as e:
+                    logger.error(f"❌ Rescan of recent NewsSubmitted logs failed: {e}")
                 
                 # Keep listening for events
                 async for message in ws:
@@ -448,8 +838,12 @@ async def start_blockchain_monitoring():
                         
                         event_data = json.loads(message)
                         if 'params' in event_data and 'result' in event_data['params']:
-                            logger.info("🎉 Detected NewsSubmitted event, processing...")
-                            await process_news_event(event_data, contract, web3_instance)
+                            topics = event_data['params']['result'].get('topics') or ['']
+                            if topics[0].lower() == news_verified_topic.lower():
+                                await process_verified_event(event_data, target)
+                                continue
+                            
+                            await handle_submitted_log(event_data, target)
                         
                     except json.JSONDecodeError:
                         logger.error("Invalid JSON in WebSocket message")
@@ -464,12 +858,87 @@ async def start_blockchain_monitoring():
             await asyncio.sleep(2)
 
 
-async def handle_client(websocket, path):
-    """Handle WebSocket client connections - EXACT working pattern"""
+def find_target(name=None):
+    """Target by name - the first configured target when no name is given"""
+    if not targets:
+        raise ValueError("No chain targets are configured")
+    if name is None:
+        return targets[0]
+    for target in targets:
+        if target.name == name:
+            return target
+    raise ValueError(f"Unknown target: {name}")
+
+
+def client_key(websocket):
+    """Quota key for a WebSocket client - all connections from one host share a quota"""
+    address = getattr(websocket, "remote_address", None)
+    if isinstance(address, (tuple, list)) and address:
+        return address[0]
+    return id(websocket)
+
+
+async def run_sentence_verification(websocket, claim, evidence):
+    """Run one interactive verification through the scheduler and reply to the client"""
     global setup_completed
     
+    async def notify_queued(position, eta):
+        await websocket.send(json.dumps({
+            "type": "status",
+            "message": f"🔍 Queued verification for claim: '{claim[:50]}...'",
+            "queue_position": position,
+            "eta_seconds": eta
+        }))
+    
+    try:
+        result = await scheduler.submit(
+            PRIORITY_INTERACTIVE,
+            lambda: run_prover(claim, evidence, Config.PROVE_TIMEOUT),
+            client_id=client_key(websocket),
+            on_queued=notify_queued
+        )
+        
+        if not setup_completed:
+            setup_completed = True
+            await websocket.send(json.dumps({
+                "type": "status",
+                "message": "✅ Circuit setup completed"
+            }))
+        
+        # Send result
+        await websocket.send(json.dumps({
+            "type": "sentence_verification_result",
+            "result": result.to_dict()
+        }))
+        
+        logger.info(f"Verification completed: {bool(result.binary_decision)}")
+        
+    except SchedulerBusy as e:
+        await websocket.send(json.dumps({
+            "type": "busy",
+            "message": f"Server busy ({e.reason}), queue position {e.position}, ETA {e.eta}s",
+            "queue_position": e.position,
+            "eta_seconds": e.eta
+        }))
+    except ConnectionClosed:
+        logger.info("Client disconnected before verification result was sent")
+    except Exception as e:
+        error_msg = f"Verification failed: {str(e)}"
+        logger.error(error_msg)
+        try:
+            await websocket.send(json.dumps({
+                "type": "error",
+                "message": error_msg
+            }))
+        except ConnectionClosed:
+            pass
+
+
+async def handle_client(websocket, path):
+    """Handle WebSocket client connections - EXACT working pattern"""
     websocket_clients.add(websocket)
     logger.info(f"New client connected. Total clients: {len(websocket_clients)}")
+    verifications = set()  # this connection's jobs - cancelled when it closes
     
     try:
         async for message in websocket:
@@ -488,48 +957,52 @@ async def handle_client(websocket, path):
                         }))
                         continue
                     
-                    # Notify start of verification
+                    # Verify in the background so this connection stays responsive
+                    task = asyncio.create_task(run_sentence_verification(websocket, claim, evidence))
+                    verifications.add(task)
+                    task.add_done_callback(verifications.discard)
+                
+                elif data.get("type") == "subscribe":
+                    feed.subscribe(websocket)
                     await websocket.send(json.dumps({
-                        "type": "status",
-                        "message": f"🔍 Starting verification for claim: '{claim[:50]}...'"
+                        "type": "subscribed",
+                        "events": list(EVENTS)
+                    }))
+                
+                elif data.get("type") == "unsubscribe":
+                    feed.unsubscribe(websocket)
+                    await websocket.send(json.dumps({
+                        "type": "unsubscribed"
+                    }))
+                
+                elif data.get("type") == "news_query":
+                    target = find_target(data.get("target"))
+                    if target.news_index is None:
+                        raise ValueError("News index is not available")
+                    page = target.news_index.query(
+                        reporter=data.get("reporter"),
+                        status=data.get("status"),
+                        since=data.get("since"),
+                        until=data.get("until"),
+                        cursor=data.get("cursor"),
+                        limit=data.get("limit")
+                    )
+                    await websocket.send(json.dumps({
+                        "type": "news_query_result",
+                        "target": target.name,
+                        **page
                     }))
-                    
-                    try:
-                        # Use minimal model - setup only on first use
-                        result = await setup_and_verify(
-                            claim,
-                            evidence,
-                            setup_required=False
-                        )
-                        
-                        if not setup_completed:
-                            setup_completed = True
-                            await websocket.send(json.dumps({
-                                "type": "status",
-                                "message": "✅ Circuit setup completed"
-                            }))
-                        
-                        # Send result
-                        await websocket.send(json.dumps({
-                            "type": "sentence_verification_result",
-                            "result": result
-                        }))
-                        
-                        logger.info(f"Verification completed: {bool(result['binary_decision'])}")
-                        
-                    except Exception as e:
-                        error_msg = f"Verification failed: {str(e)}"
-                        logger.error(error_msg)
-                        await websocket.send(json.dumps({
-                            "type": "error",
-                            "message": error_msg
-                        }))
                 
                 elif data.get("type") == "health_check":
+                    # status is "starting" until the warm-up has the prover hot, then "ready"
                     await websocket.send(json.dumps({
                         "type": "health_check_response",
-                        "status": "healthy",
-                        "setup_completed": setup_completed
+                        **readiness.to_dict(),
+                        "setup_completed": setup_completed,
+                        "queue_length": scheduler.queue_length() if scheduler else 0,
+                        "feed_subscribers": len(feed),
+                        "log_records_dropped": dropped_records(),
+                        "targets": [target.name for target in targets]
                     }))
                 
                 else:
@@ -555,13 +1028,129 @@ async def handle_client(websocket, path):
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
     finally:
+        # Nobody is left to read the results - free the queue and the prover
+        for task in verifications:
+            task.cancel()
         websocket_clients.discard(websocket)
+        feed.unsubscribe(websocket)
         logger.info(f"Client removed. Total clients: {len(websocket_clients)}")
 
 
+async def start_targets():
+    """Listeners, fleet sweepers and chain monitoring for every target"""
+    for target in targets:
+        # Local news index serving paginated queries instead of getAllNews
+        target.news_index = NewsIndex(target.news_index_path)
+        
+        # Verifier accounts for settlement, with balance monitoring
+        try:
+            get_event_listener(target).signers.start_monitoring()
+        except Exception as e:
+            logger.warning(f"⚠️ Settlement on {target.name} disabled until a verifier account is configured: {e}")
+        
+        # Fleet mode - several nodes share jobs through leases in a common store
+        if target.fleet_store_path:
+            target.fleet = JobLeaseStore(target.fleet_store_path)
+            logger.info(f"🛰️ Fleet mode enabled on {target.name} as node {target.fleet.node_id} ({target.fleet_store_path})")
+            sweep_task = asyncio.create_task(sweep_expired_leases(target))
+            background_tasks.add(sweep_task)
+            target.tasks.append(sweep_task)
+        
+        # Start blockchain monitoring in background
+        monitor_task = asyncio.create_task(start_blockchain_monitoring(target))
+        background_tasks.add(monitor_task)
+        target.tasks.append(monitor_task)
+
+
+def stop_targets():
+    """Undo start_targets - subscriptions, queued and running jobs, sweepers and balance monitoring"""
+    for target in targets:
+        for task in target.tasks + list(target.job_tasks.values()):
+            task.cancel()
+        target.tasks.clear()
+        if target.confirmations is not None:
+            target.confirmations.stop()
+        if target.listener is not None:
+            target.listener.signers.stop_monitoring()
+
+
+async def prefetch_embeddings(texts):
+    """Batch-encode texts into the prover's embedding cache"""
+    if prover is not None:
+        return await prover.embed(texts, Config.PROVE_TIMEOUT)
+    model = importlib.import_module("minimal_sentence_model")
+    return await asyncio.to_thread(model.prefetch_embeddings, texts)
+
+
+async def warm_prover():
+    """Load torch, ezkl and the circuit artifacts - returns the artifacts that are missing"""
+    with readiness.step("prover"):
+        if prover is not None:
+            return await prover.warm_up(Config.WARMUP_TIMEOUT)
+        model = await asyncio.to_thread(importlib.import_module, "minimal_sentence_model")
+        return await asyncio.to_thread(model.warm_up)
+
+
+async def warm_up():
+    """
+    Everything slow that used to happen before the socket was bound. Imports
+    run in threads so health checks are answered throughout.
+    """
+    global preflight
+    
+    try:
+        prover_task = asyncio.create_task(warm_prover())
+        
+        with readiness.step("web3"):
+            await asyncio.to_thread(importlib.import_module, "web3")
+            await asyncio.to_thread(importlib.import_module, "aiohttp")
+        
+        # Optional local EVM pre-flight of proofs before settlement
+        if Config.PREFLIGHT_ENABLED:
+            with readiness.step("preflight"):
+                preflight_module = await asyncio.to_thread(importlib.import_module, "preflight")
+                if preflight_module.LOCAL_EVM_AVAILABLE:
+                    preflight = preflight_module.PreflightChecker()
+                    logger.info("🧪 Pre-flight EVM verification enabled")
+                else:
+                    logger.warning("⚠️ PREFLIGHT_ENABLED set but web3[tester] is not installed - skipping pre-flight")
+        
+        # Bulk verification over HTTP, sharing the scheduler with WebSocket clients
+        if Config.BATCH_API_ENABLED:
+            with readiness.step("batch_api"):
+                batch_verifier = BatchVerifier(
+                    scheduler,
+                    lambda claim, evidence: run_prover(claim, evidence, Config.PROVE_TIMEOUT),
+                    fetch_claim,
+                    prefetch=prefetch_embeddings if Config.SEMANTIC_FEATURE else None
+                )
+                try:
+                    await start_http_api(batch_verifier)
+                except OSError as e:
+                    logger.error(f"❌ Batch HTTP API could not bind {Config.FLASK_HOST}:{Config.FLASK_PORT}: {e}")
+                except ValueError as e:
+                    logger.error(f"❌ Batch HTTP API not started: {e}")
+        
+        # No chain job is taken on before the prover can serve it
+        missing = await prover_task
+        if missing:
+            raise RuntimeError(f"Circuit artifacts missing: {', '.join(missing)}")
+        
+        with readiness.step("targets"):
+            await start_targets()
+        
+        readiness.mark_ready()
+        logger.info(f"✅ Warm-up complete - ready to prove ({readiness.steps})")
+    except Exception as e:
+        # A node that reports failed must not keep claiming chain jobs it cannot prove
+        stop_targets()
+        readiness.mark_failed(str(e))
+        logger.error(f"❌ Warm-up failed: {e}", exc_info=True)
+
+
 async def start_server():
     """Start the WebSocket server - EXACT working pattern"""
-    global server
+    global server, scheduler, processed_events, targets, prover
     
     host = "0.0.0.0"
     port = 8765
@@ -573,12 +1162,30 @@ async def start_server():
     Config.validate_config()
     
     try:
-        # Start blockchain monitoring in background
-        blockchain_task = asyncio.create_task(start_blockchain_monitoring())
+        # Single scheduler in front of the prover for chain and interactive jobs of every target
+        scheduler = ProofScheduler()
+        scheduler.start()
         
-        # Start WebSocket server
-        server = await serve(handle_client, host, port)
-        logger.info("✅ WebSocket server started successfully")
+        # Proofs run in a worker process the watchdog can kill and recycle
+        if Config.PROVER_ISOLATION:
+            prover = ProverProcess()
+        
+        # Idempotency index so resubscriptions never prove the same log twice
+        processed_events = ProcessedEvents()
+        
+        # One subscription, backfill and submitter per PolkaNews deployment
+        targets = load_targets()
+        logger.info(f"🎯 Serving {len(targets)} target(s): {', '.join(t.name for t in targets)}")
+        
+        # Bind first and answer health checks as "starting" - the heavy lifting happens in warm_up()
+        server = await serve(
+            handle_client, host, port,
+            reuse_port=Config.REUSE_PORT and hasattr(socket, "SO_REUSEPORT")
+        )
+        logger.info("✅ WebSocket server started successfully - warming up")
+        
+        warmup_task = asyncio.create_task(warm_up())
+        background_tasks.add(warmup_task)
         
         # Keep server running
         await server.wait_closed()
@@ -601,7 +1208,11 @@ def signal_handler(signum, frame):
     # Close server
     if server:
         server.close()
-    
+
+    # Stop the prover process
+    if prover:
+        prover.stop()
+
     sys.exit(0)
 
 
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+
+from websockets.exceptions import ConnectionClosed
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle events pushed to subscribers
+EVENT_SUBMITTED = "submitted"
+EVENT_PROVEN = "proven"
+EVENT_SETTLED = "settled"
+EVENT_FAILED = "failed"
+EVENT_REORGED = "reorged"
+EVENTS = (EVENT_SUBMITTED, EVENT_PROVEN, EVENT_SETTLED, EVENT_FAILED, EVENT_REORGED)
+
+# Settled requests remembered so each is announced once - from our own receipt or NewsVerified
+SETTLED_MEMORY = 4096
+
+# Last message a subscriber gets before it is dropped for falling behind
+DROPPED_NOTICE = json.dumps({"type": "feed_dropped", "reason": "send buffer full"})
+
+
+class _Subscriber:
+    __slots__ = ("websocket", "queue", "task")
+
+    def __init__(self, websocket, buffer_size):
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+        self.task = None
+
+
+class VerificationFeed:
+    """
+    Push stream of verification job events for subscribed WebSocket clients.
+
+    Every subscriber has its own bounded send buffer drained by its own task,
+    so a slow client never delays the prover or other clients. A subscriber
+    whose buffer overflows is dropped from the feed and told so with a
+    final feed_dropped message.
+    """
+
+    def __init__(self, buffer_size=None):
+        self.buffer_size = buffer_size if buffer_size is not None else Config.FEED_BUFFER_SIZE
+        self._subscribers = {}
+        self._settled = OrderedDict()  # (target, requestId) already announced as settled
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def is_subscribed(self, websocket) -> bool:
+        return websocket in self._subscribers
+
+    def subscribe(self, websocket):
+        if websocket in self._subscribers:
+            return
+        subscriber = _Subscriber(websocket, self.buffer_size)
+        subscriber.task = asyncio.create_task(self._drain(subscriber))
+        self._subscribers[websocket] = subscriber
+        logger.info(f"📣 Feed subscriber added. Total subscribers: {len(self._subscribers)}")
+
+    def unsubscribe(self, websocket):
+        subscriber = self._subscribers.pop(websocket, None)
+        if subscriber is None:
+            return
+        if subscriber.task is not None and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+        logger.info(f"📣 Feed subscriber removed. Total subscribers: {len(self._subscribers)}")
+
+    def publish(self, event: str, request_id=None, content_hash=None, **fields):
+        """Encode an event once and queue it for every subscriber - never blocks"""
+        if not self._subscribers:
+            return
+
+        payload = {"type": "feed_event", "event": event, "ts": int(time.time())}
+        if request_id is not None:
+            payload["requestId"] = request_id
+        if content_hash is not None:
+            payload["contentHash"] = content_hash
+        payload.update(fields)
+        message = json.dumps(payload, separators=(",", ":"))
+
+        for websocket, subscriber in list(self._subscribers.items()):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("⚠️ Dropping slow feed subscriber - send buffer full")
+                self._drop(websocket, subscriber)
+
+    def publish_settled(self, target: str, request_id, content_hash=None, **fields) -> bool:
+        """
+        Announce a settlement once per request - whichever comes first of this node's
+        receipt and the NewsVerified log (which also covers jobs settled by a peer or by
+        this node before a restart). Returns False if it was already announced.
+        """
+        key = (target, request_id)
+        if key in self._settled:
+            return False
+        self._settled[key] = None
+        if len(self._settled) > SETTLED_MEMORY:
+            self._settled.popitem(last=False)
+        self.publish(EVENT_SETTLED, request_id, content_hash, target=target, **fields)
+        return True
+
+    def forget_settled(self, target: str, request_id):
+        """The settlement was reorged out - announce it again if it is mined again"""
+        self._settled.pop((target, request_id), None)
+
+    def _drop(self, websocket, subscriber):
+        """Stop feeding a subscriber - its task sends the notice instead of the backlog, then exits"""
+        del self._subscribers[websocket]
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    async def _drain(self, subscriber):
+        try:
+            while True:
+                message = await subscriber.queue.get()
+                if message is None:
+                    await subscriber.websocket.send(DROPPED_NOTICE)
+                    return
+                await subscriber.websocket.send(message)
+        except ConnectionClosed:
+            self.unsubscribe(subscriber.websocket)
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,141 @@
+import codecs
+import json
+import re
+from typing import Any, Optional
+
+from config import Config
+
+# Structural characters outside strings, and the characters that matter inside them
+_STRUCTURAL = re.compile(r'["{}\[\],:]')
+_IN_STRING = re.compile(r'["\\]')
+
+_MISSING = object()
+
+
+class IPFSFetchError(Exception):
+    """Raised when IPFS content cannot be fetched within the configured limits"""
+
+
+class JSONFieldExtractor:
+    """
+    Incremental extractor for one top-level field of a JSON object.
+
+    Bytes are fed as they arrive; the field's value is returned as soon as it
+    is complete, so the rest of a large document never has to be read or parsed.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._expect_key = False
+        self._last_key = None
+        self._value_start = None
+
+    def feed(self, chunk: bytes) -> Any:
+        """Returns the field value once complete, otherwise _MISSING"""
+        self._text += self._decoder.decode(chunk)
+        return self._scan()
+
+    def finish(self) -> Any:
+        """End of stream without an early match - fall back to a full parse"""
+        self._text += self._decoder.decode(b"", final=True)
+        value = self._scan()
+        if value is not _MISSING:
+            return value
+        document = json.loads(self._text)
+        if not isinstance(document, dict):
+            raise ValueError("IPFS content is not a JSON object")
+        return document.get(self.field)
+
+    def _complete(self, end: int) -> Any:
+        return json.loads(self._text[self._value_start:end])
+
+    def _scan(self) -> Any:
+        text = self._text
+        while True:
+            if self._in_string:
+                match = _IN_STRING.search(text, self._pos)
+                if match is None:
+                    self._pos = len(text)
+                    return _MISSING
+                if match.group() == "\\":
+                    if match.end() >= len(text):
+                        self._pos = match.start()  # escape split across chunks - wait for more
+                        return _MISSING
+                    self._pos = match.end() + 1
+                    continue
+
+                self._pos = match.end()
+                self._in_string = False
+                if self._depth == 1:
+                    if self._string_is_key:
+                        self._last_key = json.loads(text[self._string_start:self._pos])
+                    elif self._value_start is not None:
+                        return self._complete(self._pos)
+                continue
+
+            match = _STRUCTURAL.search(text, self._pos)
+            if match is None:
+                self._pos = len(text)
+                return _MISSING
+            char = match.group()
+            self._pos = match.end()
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = match.start()
+                self._string_is_key = self._depth == 1 and self._expect_key
+            elif char in "{[":
+                if self._depth == 0 and char == "[":
+                    raise ValueError("IPFS content is not a JSON object")
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+            elif char in "}]":
+                if self._depth == 1 and self._value_start is not None:
+                    return self._complete(match.start())  # scalar value ending the object
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    return self._complete(self._pos)  # object/array value closed
+                if self._depth == 0:
+                    return None  # whole object read, field absent
+            elif char == ",":
+                if self._depth == 1:
+                    if self._value_start is not None:
+                        return self._complete(match.start())  # scalar value
+                    self._expect_key = True
+            elif char == ":":
+                if self._depth == 1:
+                    self._expect_key = False
+                    if self._last_key == self.field:
+                        self._value_start = self._pos
+
+
+async def fetch_json_field(session, url: str, field: str = "content", max_bytes: Optional[int] = None) -> Any:
+    """
+    Stream a JSON document and return one top-level field, reading at most
+    max_bytes and stopping as soon as the field is complete
+    """
+    max_bytes = max_bytes if max_bytes is not None else Config.IPFS_MAX_BYTES
+    async with session.get(url) as response:
+        if response.status != 200:
+            raise IPFSFetchError(f"HTTP {response.status}")
+        if response.content_length is not None and response.content_length > max_bytes:
+            raise IPFSFetchError(f"content length {response.content_length} exceeds limit of {max_bytes} bytes")
+
+        extractor = JSONFieldExtractor(field)
+        received = 0
+        async for chunk in response.content.iter_chunked(Config.IPFS_CHUNK_SIZE):
+            received += len(chunk)
+            if received > max_bytes:
+                raise IPFSFetchError(f"body exceeds limit of {max_bytes} bytes")
+            value = extractor.feed(chunk)
+            if value is not _MISSING:
+                return value
+        return extractor.finish()
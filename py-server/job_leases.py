@@ -0,0 +1,153 @@
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+JOB_CLAIMED = "claimed"
+JOB_SETTLING = "settling"
+JOB_SETTLED = "settled"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    request_id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    lease_expires REAL NOT NULL,
+    status TEXT NOT NULL,
+    event_json TEXT,
+    tx_hash TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (status, lease_expires);
+"""
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseLost(Exception):
+    """Raised when this node no longer owns the job it was about to settle"""
+
+
+class ExpiredJob:
+    __slots__ = ("request_id", "status", "event_json")
+
+    def __init__(self, request_id, status, event_json):
+        self.request_id = request_id
+        self.status = status
+        self.event_json = event_json
+
+
+class JobLeaseStore:
+    """
+    Coordination store for a fleet of prover processes on one host (SQLite).
+
+    Single-host only: WAL needs shared memory between the processes, SQLite
+    locking is not reliable on network filesystems, and lease expiry compares
+    time.time() readings, which only agree on one machine. Do not put the
+    file on NFS/SMB to span machines.
+
+    A node must hold an unexpired lease on a requestId to prove and settle it.
+    Leases are renewed while the job runs; when a node dies its leases expire
+    and any peer can take the job over. A job is only ever moved to
+    settled once, by the node holding the lease.
+    """
+
+    def __init__(self, path: Optional[str] = None, node_id: Optional[str] = None,
+                 lease_seconds: Optional[float] = None, clock=time.time):
+        self.path = path or Config.FLEET_STORE_PATH
+        self.node_id = node_id or Config.FLEET_NODE_ID or default_node_id()
+        self.lease_seconds = lease_seconds if lease_seconds is not None else Config.FLEET_LEASE_SECONDS
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _write(self, sql, params) -> int:
+        """Run one write in an immediate transaction - returns the affected row count"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rowcount = self._db.execute(sql, params).rowcount
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return rowcount
+
+    def claim(self, request_id: int, event_json: Optional[str] = None) -> bool:
+        """
+        Take the lease on a job. Succeeds for a new job, a job this node already
+        owns, or an unsettled job whose lease has expired.
+        """
+        now = self.clock()
+        rowcount = self._write(
+            """
+            INSERT INTO jobs (request_id, owner, lease_expires, status, event_json)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (request_id) DO UPDATE SET
+                owner = excluded.owner,
+                lease_expires = excluded.lease_expires,
+                event_json = COALESCE(jobs.event_json, excluded.event_json),
+                attempts = jobs.attempts + (jobs.lease_expires < ?)
+            WHERE jobs.status != ? AND (jobs.owner = excluded.owner OR jobs.lease_expires < ?)
+            """,
+            (request_id, self.node_id, now + self.lease_seconds, JOB_CLAIMED, event_json, now, JOB_SETTLED, now)
+        )
+        return rowcount == 1
+
+    def renew(self, request_id: int) -> bool:
+        """Extend our lease - False means it was lost to another node"""
+        return self._write(
+            "UPDATE jobs SET lease_expires = ? WHERE request_id = ? AND owner = ? AND status != ?",
+            (self.clock() + self.lease_seconds, request_id, self.node_id, JOB_SETTLED)
+        ) == 1
+
+    def begin_settlement(self, request_id: int) -> bool:
+        """Mark that a transaction is about to be sent - only while we still hold the lease"""
+        return self._write(
+            "UPDATE jobs SET status = ?, lease_expires = ? "
+            "WHERE request_id = ? AND owner = ? AND status != ? AND lease_expires >= ?",
+            (JOB_SETTLING, self.clock() + self.lease_seconds, request_id, self.node_id, JOB_SETTLED, self.clock())
+        ) == 1
+
+    def mark_settled(self, request_id: int, tx_hash: Optional[str] = None) -> bool:
+        return self._write(
+            "UPDATE jobs SET status = ?, tx_hash = ? WHERE request_id = ? AND status != ?",
+            (JOB_SETTLED, tx_hash, request_id, JOB_SETTLED)
+        ) == 1
+
+    def release(self, request_id: int):
+        """Give up our lease early so a peer can retry the job straight away"""
+        self._write(
+            "UPDATE jobs SET lease_expires = 0 WHERE request_id = ? AND owner = ? AND status != ?",
+            (request_id, self.node_id, JOB_SETTLED)
+        )
+
+    def is_settled(self, request_id: int) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT status FROM jobs WHERE request_id = ?", (request_id,)).fetchone()
+        return row is not None and row[0] == JOB_SETTLED
+
+    def expired_jobs(self, max_attempts: Optional[int] = None, limit: int = 16) -> List[ExpiredJob]:
+        """Unsettled jobs whose owner stopped renewing - candidates for takeover"""
+        max_attempts = max_attempts if max_attempts is not None else Config.FLEET_MAX_ATTEMPTS
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT request_id, status, event_json FROM jobs "
+                "WHERE status != ? AND lease_expires < ? AND attempts < ? ORDER BY request_id LIMIT ?",
+                (JOB_SETTLED, self.clock(), max_attempts, limit)
+            ).fetchall()
+        return [ExpiredJob(*row) for row in rows]
@@ -1,11 +1,16 @@
 import asyncio
 import json
+import logging
 import os
+import re
 import torch
 import torch.nn as nn
 import ezkl
 import numpy as np
-from config import Paths
+from config import Config, Paths
+from verification_result import VerificationResult
+
+logger = logging.getLogger(__name__)
 
 # MINIMAL MODEL for Claim + Evidence Binary Classification
 class BinaryClaimVerificationModel(nn.Module):
@@ -24,29 +29,66 @@ class BinaryClaimVerificationModel(nn.Module):
         return self.net(x)
 
 # Initialize minimal model
-claim_verification_model = BinaryClaimVerificationModel()
+# 6 lexical features, plus claim-evidence embedding similarity when SEMANTIC_FEATURE is on
+FEATURE_COUNT = 7 if Config.SEMANTIC_FEATURE else 6
+
+claim_verification_model = BinaryClaimVerificationModel(input_size=FEATURE_COUNT)
 claim_verification_model.eval()
 
+_semantic = None
+
+def semantic_similarity():
+    """Shared SemanticSimilarity - loads the embedding model and cache on first use"""
+    global _semantic
+    if _semantic is None:
+        from embeddings import SemanticSimilarity, SEMANTIC_AVAILABLE
+        if not SEMANTIC_AVAILABLE:
+            raise RuntimeError("SEMANTIC_FEATURE is set but sentence-transformers is not installed")
+        _semantic = SemanticSimilarity()
+    return _semantic
+
+def prefetch_embeddings(texts):
+    """Encode texts in batches ahead of proving, so their features are cache hits"""
+    if Config.SEMANTIC_FEATURE:
+        semantic_similarity().embed(texts)
+
+# Tokens are whitespace-separated runs, exactly like str.split()
+_TOKEN_RE = re.compile(r"\S+")
+
+def bounded_tokens(text, max_tokens=None, max_chars=None):
+    """
+    First max_tokens lowercased tokens of text, never looking past max_chars.
+    Identical to text.lower().split() for anything below both limits.
+    """
+    max_tokens = max_tokens if max_tokens is not None else Config.FEATURE_MAX_TOKENS
+    max_chars = max_chars if max_chars is not None else Config.FEATURE_MAX_CHARS
+    tokens = []
+    for match in _TOKEN_RE.finditer(text, 0, max_chars):
+        if len(tokens) >= max_tokens:
+            break
+        tokens.append(match.group().lower())
+    return tokens
+
 def extract_claim_evidence_features(claim, evidence):
     """
     Extract minimal but meaningful features for claim+evidence verification
-    Returns 6 features that capture key relationships
+    Returns 6 features that capture key relationships, 7 with SEMANTIC_FEATURE
     """
     # Basic length features (normalized)
     claim_len = min(len(claim), 200) / 200.0
     evidence_len = min(len(evidence), 200) / 200.0
     
-    # Word count features (normalized)
-    claim_words = min(len(claim.split()), 30) / 30.0
-    evidence_words = min(len(evidence.split()), 30) / 30.0
+    # Bounded tokenization - cost stays flat for huge articles or evidence dumps
+    claim_tokens = bounded_tokens(claim)
+    evidence_tokens = bounded_tokens(evidence)
     
-    # Simple overlap features (key for verification)
-    claim_lower = claim.lower()
-    evidence_lower = evidence.lower()
+    # Word count features (normalized)
+    claim_words = min(len(claim_tokens), 30) / 30.0
+    evidence_words = min(len(evidence_tokens), 30) / 30.0
     
-    # Word overlap ratio
-    claim_set = set(claim_lower.split())
-    evidence_set = set(evidence_lower.split())
+    # Word overlap ratio (key for verification)
+    claim_set = set(claim_tokens)
+    evidence_set = set(evidence_tokens)
     if len(claim_set) > 0:
         word_overlap = len(claim_set.intersection(evidence_set)) / len(claim_set)
     else:
@@ -58,7 +100,13 @@ def extract_claim_evidence_features(claim, evidence):
     else:
         length_ratio = 0.0
     
-    return [claim_len, evidence_len, claim_words, evidence_words, word_overlap, length_ratio]
+    features = [claim_len, evidence_len, claim_words, evidence_words, word_overlap, length_ratio]
+    
+    # Semantic agreement - one scalar, so the circuit only grows by a single input
+    if Config.SEMANTIC_FEATURE:
+        features.append(semantic_similarity().similarities([(claim, evidence)])[0])
+    
+    return features
 
 async def create_evm_verifier_with_subprocess():
     """Create EVM verifier by calling the ezkl binary directly."""
@@ -116,7 +164,7 @@ async def setup_minimal_verification_circuit():
     
     # Export minimal model to ONNX
     print("📦 Exporting minimal verification model...")
-    dummy_input = torch.rand(1, 6)  # 6 features
+    dummy_input = torch.rand(1, FEATURE_COUNT)
     torch.onnx.export(
         claim_verification_model,
         dummy_input,
@@ -194,23 +242,12 @@ async def verify_claim_with_proof(claim, evidence):
     Verify claim against evidence and generate ZK proof
     Returns binary decision (0/1) with cryptographic proof
     """
-    print(f"🔍 Verifying claim against evidence...")
-    print(f"📝 Claim: '{claim}'")
-    print(f"📝 Evidence: '{evidence}'")
+    # Verbose output is DEBUG (sampled per request) and interpolated lazily
+    logger.debug("🔍 Verifying claim %r against evidence %r", claim, evidence)
     
     # Extract features
     features = extract_claim_evidence_features(claim, evidence)
-    print(f"📊 Features: {[f'{f:.3f}' for f in features]}")
-    
-    # Run model inference
-    input_tensor = torch.tensor(features, dtype=torch.float32).reshape(1, -1)
-    with torch.no_grad():
-        model_output = claim_verification_model(input_tensor)
-        verification_score = model_output.item()
-        binary_decision = 1 if verification_score >= 0.5 else 0
-    
-    # print(f"🎯 Verification Score: {verification_score:.4f}")
-    # print(f"⚖️  Binary Decision: {'✅ VERIFIED' if binary_decision == 1 else '❌ NOT VERIFIED'}")
+    logger.debug("📊 Features: %s", features)
     
     # Prepare input for ZK proof
     verification_data = {"input_data": [features]}
@@ -218,12 +255,12 @@ async def verify_claim_with_proof(claim, evidence):
         json.dump(verification_data, f)
     
     # Generate witness
-    print("🔄 Generating cryptographic witness...")
+    logger.debug("🔄 Generating cryptographic witness...")
     res = await ezkl.gen_witness(Paths.INPUT_PATH, Paths.COMPILED_PATH, Paths.WITNESS_PATH)
     assert os.path.isfile(Paths.WITNESS_PATH), "Witness generation failed"
     
     # Generate ZK proof - PROVEN FAST approach
-    print("🔐 Generating zero-knowledge proof...")
+    logger.debug("🔐 Generating zero-knowledge proof...")
     proof = ezkl.prove(
         Paths.WITNESS_PATH,
         Paths.COMPILED_PATH,
@@ -234,47 +271,68 @@ async def verify_claim_with_proof(claim, evidence):
     assert os.path.isfile(Paths.PROOF_PATH), "Proof generation failed"
     
     # Verify proof
-    print("✅ Verifying proof...")
+    logger.debug("✅ Verifying proof...")
     verify_result = ezkl.verify(Paths.PROOF_PATH, Paths.SETTINGS_PATH, Paths.VK_PATH)
     assert verify_result == True, "Proof verification failed"
     
-    print("🎉 Claim verification with ZK proof completed successfully!")
     
-    # Debug: Check proof structure
-    print(f"🔍 Debug - Proof type: {type(proof)}")
-    print(f"🔍 Debug - Proof keys: {list(proof.keys()) if isinstance(proof, dict) else 'Not a dict'}")
-    if isinstance(proof, dict) and 'instances' in proof:
-        print(f"🔍 Debug - Instances: {proof['instances']}")
-        print(f"🔍 Debug - Instances length: {len(proof['instances'])}")
-    else:
-        print("🔍 Debug - No instances found in proof!")
+    # The decision is the proven output, not a fresh forward pass - the in-process model is
+    # re-initialised on every start, while the circuit holds the weights exported at setup
+    verification_score = proven_score(proof)
+    binary_decision = 1 if verification_score >= 0.5 else 0
+    logger.debug("🎯 Verification score: %.4f", verification_score)
+    
+    # Public inputs straight to uint256 integers - flattened in ezkl order
+    instances = [
+        int(ezkl.felt_to_big_endian(field_element), 16)
+        for value in proof["instances"]
+        for field_element in value
+    ]
+    logger.info(
+        "🎉 Claim verification with ZK proof completed",
+        extra={"fields": {"binary_decision": binary_decision, "public_inputs": len(instances)}}
+    )
     
-    # Format public inputs - EXACT working pattern from risk_model.py
-    def format_pub_inputs(proof_obj):
-        inputs_arr = []
-        formatted = "["
-        for i, value in enumerate(proof_obj["instances"]):
-            for j, field_element in enumerate(value):
-                big_endian_val = ezkl.felt_to_big_endian(field_element)
-                inputs_arr.append(big_endian_val)
-                formatted += '"' + str(big_endian_val) + '"'
-                if j != len(value) - 1:
-                    formatted += ", "
-            if i != len(proof_obj["instances"]) - 1:
-                formatted += ", "
-        formatted += "]"
-        return formatted  # Return formatted string like working example
+    return VerificationResult(
+        proof_verified=True,
+        binary_decision=binary_decision,
+        proof=bytes.fromhex(proof["proof"].removeprefix("0x")),
+        instances=instances,
+    )
+
+def proven_score(proof):
+    """Model output committed to by the proof - the last public instance, rescaled to a float"""
+    with open(Paths.SETTINGS_PATH) as f:
+        output_scale = json.load(f)["model_output_scales"][0]
+    return ezkl.felt_to_float(proof["instances"][0][-1], output_scale)
+
+def warm_up():
+    """
+    Read the circuit artifacts every proof loads into the page cache.
+    Returns the ones that are missing - proving cannot work until they exist.
+    """
+    missing = []
+    for path in (Paths.COMPILED_PATH, Paths.PK_PATH, Paths.VK_PATH, Paths.SETTINGS_PATH):
+        try:
+            with open(path, 'rb') as f:
+                while f.read(1 << 20):
+                    pass
+        except FileNotFoundError:
+            missing.append(path)
     
-    pub_inputs = format_pub_inputs(proof)
-    print(f"🔍 Debug - Formatted pub_inputs: {pub_inputs}")
+    # Artifacts built for a different feature count would fail on every proof
+    if Paths.SETTINGS_PATH not in missing:
+        with open(Paths.SETTINGS_PATH) as f:
+            shapes = json.load(f).get("model_instance_shapes") or [[FEATURE_COUNT]]
+        if shapes[0][-1] != FEATURE_COUNT:
+            raise RuntimeError(
+                f"Circuit was built for {shapes[0][-1]} features but the model uses {FEATURE_COUNT} - "
+                "rerun the circuit setup after changing SEMANTIC_FEATURE"
+            )
     
-    # Return ONLY the 4 required fields - MATCH working example format
-    return {
-        "proof_verified": True,
-        "binary_decision": binary_decision,
-        "proof": proof["proof"],  # Return hex string (like working example)
-        "pub_inputs": pub_inputs,  # Return formatted string (like working example)
-    }
+    if Config.SEMANTIC_FEATURE:
+        semantic_similarity().embed(["warm up"])
+    return missing
 
 # Public interface function
 async def setup_and_verify(claim, evidence, setup_required=False):
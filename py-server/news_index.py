@@ -0,0 +1,209 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from chain_reads import read_response
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_VERIFIED = "verified"
+STATUS_REJECTED = "rejected"
+STATUSES = (STATUS_PENDING, STATUS_VERIFIED, STATUS_REJECTED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    request_id INTEGER PRIMARY KEY,
+    content_hash TEXT,
+    reporter TEXT,
+    timestamp INTEGER,
+    block_number INTEGER,
+    tx_hash TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    verified_tx_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS news_reporter ON news (reporter, request_id);
+CREATE INDEX IF NOT EXISTS news_status ON news (status, request_id);
+CREATE INDEX IF NOT EXISTS news_timestamp ON news (timestamp, request_id);
+"""
+
+_COLUMNS = ("request_id", "content_hash", "reporter", "timestamp", "block_number", "tx_hash", "status", "verified_tx_hash")
+
+
+class NewsIndex:
+    """
+    Local SQLite index of NewsSubmitted / NewsVerified events.
+
+    Kept up to date from the log subscription and serves keyset-paginated
+    queries, so reads never touch the chain and do not slow down as the
+    number of articles grows.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.NEWS_INDEX_PATH
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def record_submitted(self, request_id: int, content_hash: str, reporter: str,
+                         timestamp: Optional[int] = None, block_number: Optional[int] = None,
+                         tx_hash: Optional[str] = None):
+        """Insert or fill in an article - keeps any status already recorded by NewsVerified"""
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO news (request_id, content_hash, reporter, timestamp, block_number, tx_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (request_id) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    reporter = excluded.reporter,
+                    timestamp = excluded.timestamp,
+                    block_number = COALESCE(excluded.block_number, news.block_number),
+                    tx_hash = COALESCE(excluded.tx_hash, news.tx_hash)
+                """,
+                (request_id, content_hash, reporter.lower() if reporter else None,
+                 int(timestamp if timestamp is not None else time.time()), block_number, tx_hash)
+            )
+            self._db.commit()
+
+    def record_verified(self, request_id: int, is_verified: bool, tx_hash: Optional[str] = None):
+        """Record the outcome of NewsVerified - the article row may not have been seen yet"""
+        status = STATUS_VERIFIED if is_verified else STATUS_REJECTED
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO news (request_id, status, verified_tx_hash) VALUES (?, ?, ?)
+                ON CONFLICT (request_id) DO UPDATE SET
+                    status = excluded.status,
+                    verified_tx_hash = COALESCE(excluded.verified_tx_hash, news.verified_tx_hash)
+                """,
+                (request_id, status, tx_hash)
+            )
+            self._db.commit()
+
+    def remove(self, request_id: int):
+        """Drop an article whose NewsSubmitted log was removed by a reorg"""
+        with self._lock:
+            self._db.execute("DELETE FROM news WHERE request_id = ?", (request_id,))
+            self._db.commit()
+
+    def reset_status(self, request_id: int):
+        """Back to pending after the NewsVerified log was removed by a reorg"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE news SET status = ?, verified_tx_hash = NULL WHERE request_id = ?",
+                (STATUS_PENDING, request_id)
+            )
+            self._db.commit()
+
+    def last_request_id(self) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT MAX(request_id) FROM news WHERE content_hash IS NOT NULL").fetchone()
+        return row[0] or 0
+
+    def missing_request_ids(self, upto: int) -> List[int]:
+        """Request IDs 1..upto without a recorded article - including gaps below later-seen IDs"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT request_id FROM news WHERE content_hash IS NOT NULL AND request_id <= ? ORDER BY request_id",
+                (upto,)
+            ).fetchall()
+        missing = []
+        expected = 1
+        for (request_id,) in rows:
+            missing.extend(range(expected, request_id))
+            expected = request_id + 1
+        missing.extend(range(expected, upto + 1))
+        return missing
+
+    def pending_request_ids(self) -> List[int]:
+        with self._lock:
+            rows = self._db.execute("SELECT request_id FROM news WHERE status = ?", (STATUS_PENDING,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, request_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM news WHERE request_id = ?", (request_id,)
+            ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def query(self, reporter: Optional[str] = None, status: Optional[str] = None,
+              since: Optional[int] = None, until: Optional[int] = None,
+              cursor: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Newest-first page of articles.
+        Pass the returned next_cursor back as cursor to get the following page.
+        """
+        if status is not None and status not in STATUSES:
+            raise ValueError(f"Unknown status: {status}")
+        limit = max(1, min(int(limit or Config.NEWS_PAGE_SIZE), Config.NEWS_MAX_PAGE_SIZE))
+
+        clauses = ["content_hash IS NOT NULL"]
+        params = []
+        if reporter:
+            clauses.append("reporter = ?")
+            params.append(reporter.lower())
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(int(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(int(until))
+        if cursor is not None:
+            clauses.append("request_id < ?")
+            params.append(int(cursor))
+
+        sql = (f"SELECT {', '.join(_COLUMNS)} FROM news WHERE {' AND '.join(clauses)} "
+               f"ORDER BY request_id DESC LIMIT ?")
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+
+        items = [dict(zip(_COLUMNS, row)) for row in rows[:limit]]
+        next_cursor = items[-1]["request_id"] if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def backfill(self, contract, page_size: int = 100):
+        """
+        Fill in every article the index is missing - from downtime or a dropped
+        subscription - and refresh the status of articles still pending.
+        Blocking - run it in a thread.
+        """
+        news_count = contract.functions.getNewsCount().call()
+        missing = self.missing_request_ids(news_count)
+        if missing:
+            logger.info(f"🗃️ Backfilling news index: {len(missing)} missing article(s) up to {news_count}")
+        for run in _runs(missing, page_size):
+            # Request IDs start at 1 and articles are stored in order, so ID n sits at index n - 1
+            for article in contract.functions.getNewsArticles(run[0] - 1, len(run)).call():
+                request_id, content_hash, reporter, timestamp = article[:4]
+                self.record_submitted(request_id, content_hash, reporter, timestamp)
+
+        for request_id in self.pending_request_ids():
+            response = read_response(contract, request_id)
+            if response is not None:
+                self.record_verified(request_id, response[3])  # binaryDecision
+
+
+def _runs(request_ids: List[int], max_len: int) -> List[List[int]]:
+    """Consecutive runs of sorted IDs, at most max_len long - one range read each"""
+    runs = []
+    for request_id in request_ids:
+        if runs and request_id == runs[-1][-1] + 1 and len(runs[-1]) < max_len:
+            runs[-1].append(request_id)
+        else:
+            runs.append([request_id])
+    return runs
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import os
+from typing import List, Optional
+
+from config import Config, Paths
+
+logger = logging.getLogger(__name__)
+
+# Optional dependencies - pre-flight is disabled when they are missing
+try:
+    from web3 import Web3, EthereumTesterProvider
+    import eth_tester  # noqa: F401 - pulls in the py-evm backend
+    LOCAL_EVM_AVAILABLE = True
+except ImportError:
+    LOCAL_EVM_AVAILABLE = False
+
+try:
+    import solcx
+except ImportError:
+    solcx = None
+
+# submitVerificationResponse(NewsVerificationResponse) as in contract_abi.json
+RESPONSE_TYPE = "(uint256,string,bool,bool,bytes,uint256[])"
+SUBMIT_SIGNATURE = f"submitVerificationResponse({RESPONSE_TYPE})"
+
+# Intrinsic gas of any transaction
+TX_BASE_GAS = 21000
+# Calldata bytes
+CALLDATA_ZERO_BYTE_GAS = 4
+CALLDATA_BYTE_GAS = 16
+# Gas per storage slot written by submitVerificationResponse (fresh SSTORE)
+SSTORE_GAS = 22100
+# requestId and the packed isProofVerified/binaryDecision flags of StoredVerificationResponse
+RESPONSE_FIXED_SLOTS = 2
+
+
+class PreflightReport:
+    """Result of running one proof through the local verifier"""
+    __slots__ = ("ok", "verifier_gas", "expected_gas", "error")
+
+    def __init__(self, ok: bool, verifier_gas: int = 0, expected_gas: int = 0, error: Optional[str] = None):
+        self.ok = ok
+        self.verifier_gas = verifier_gas
+        self.expected_gas = expected_gas
+        self.error = error
+
+
+def dynamic_slots(length: int) -> int:
+    """Storage slots of a string/bytes value - inline below 32 bytes, else a length slot plus data"""
+    return 1 if length < 32 else 1 + (length + 31) // 32
+
+
+def submission_calldata(response: tuple) -> bytes:
+    """Calldata of submitVerificationResponse(response), byte for byte"""
+    from eth_abi import encode
+    from eth_utils import function_signature_to_4byte_selector
+
+    return function_signature_to_4byte_selector(SUBMIT_SIGNATURE) + encode([RESPONSE_TYPE], [response])
+
+
+def estimate_submission_gas(verifier_gas: int, calldata: bytes, content_hash: str, proof: bytes,
+                            instances: list) -> int:
+    """
+    Upper estimate for submitVerificationResponse given the verifier's own gas:
+    intrinsic and calldata gas, the verifier call, storing the response, plus a
+    buffer for the reward mint and NewsVerified event
+    """
+    zero_bytes = calldata.count(0)
+    calldata_gas = zero_bytes * CALLDATA_ZERO_BYTE_GAS + (len(calldata) - zero_bytes) * CALLDATA_BYTE_GAS
+    storage_slots = (RESPONSE_FIXED_SLOTS
+                     + dynamic_slots(len(content_hash.encode()))
+                     + dynamic_slots(len(proof))
+                     + 1 + len(instances))  # pubInputs length and elements
+    return (TX_BASE_GAS
+            + calldata_gas
+            + verifier_gas
+            + storage_slots * SSTORE_GAS
+            + Config.PREFLIGHT_GAS_BUFFER)
+
+
+def load_verifier_bytecode() -> str:
+    """Deployment bytecode of verifier.sol - compiled once with solc, then cached next to it"""
+    if os.path.isfile(Paths.VERIFIER_BIN_PATH):
+        with open(Paths.VERIFIER_BIN_PATH, 'r') as f:
+            return f.read().strip()
+
+    if solcx is None:
+        raise RuntimeError(f"{Paths.VERIFIER_BIN_PATH} not found and py-solc-x is not installed")
+
+    logger.info(f"🛠️ Compiling {Paths.SOL_CODE_PATH} with solc {Config.PREFLIGHT_SOLC_VERSION}")
+    solcx.install_solc(Config.PREFLIGHT_SOLC_VERSION)
+    compiled = solcx.compile_files(
+        [Paths.SOL_CODE_PATH],
+        output_values=["bin"],
+        solc_version=Config.PREFLIGHT_SOLC_VERSION,
+        optimize=True,
+        optimize_runs=1,
+    )
+    bytecode = next(iter(compiled.values()))["bin"]
+    with open(Paths.VERIFIER_BIN_PATH, 'w') as f:
+        f.write(bytecode)
+    return bytecode
+
+
+class LocalVerifier:
+    """The generated Halo2Verifier deployed into an in-process py-evm chain"""
+
+    def __init__(self):
+        if not LOCAL_EVM_AVAILABLE:
+            raise RuntimeError("Local EVM not available - install web3[tester]")
+
+        with open(Paths.ABI_PATH, 'r') as f:
+            abi = json.load(f)
+
+        self.web3 = Web3(EthereumTesterProvider())
+        self.sender = self.web3.eth.accounts[0]
+        factory = self.web3.eth.contract(abi=abi, bytecode=load_verifier_bytecode())
+        tx_hash = factory.constructor().transact({'from': self.sender})
+        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        self.contract = self.web3.eth.contract(address=receipt['contractAddress'], abi=abi)
+        logger.info(f"🧪 Local verifier deployed at {receipt['contractAddress']}")
+
+    def check(self, response: tuple) -> PreflightReport:
+        """
+        Run the response's proof and pubInputs through verifyProof, the call
+        submitVerificationResponse makes. PolkaNews itself is not deployed
+        here - its gas share comes from the encoded calldata and storage layout.
+        """
+        _, content_hash, _, _, proof, instances = response
+        call = self.contract.functions.verifyProof(proof, instances)
+        try:
+            calldata = submission_calldata(response)  # fails like the real call for out-of-range values
+            if not call.call({'from': self.sender}):
+                return PreflightReport(False, error="verifier returned false")
+            verifier_gas = call.estimate_gas({'from': self.sender})
+        except Exception as e:
+            return PreflightReport(False, error=str(e))
+        expected_gas = estimate_submission_gas(verifier_gas, calldata, content_hash, proof, instances)
+        return PreflightReport(True, verifier_gas, expected_gas)
+
+    def check_many(self, responses: List[tuple]) -> List[PreflightReport]:
+        return [self.check(response) for response in responses]
+
+
+class PreflightChecker:
+    """
+    Runs proofs through the local verifier before they are submitted.
+
+    Checks that arrive within PREFLIGHT_BATCH_WINDOW of each other are run
+    together in one worker-thread hop, so the event loop is never blocked by
+    EVM execution. A failure to set up the local EVM (missing verifier.bin or
+    solc, deploy error) is raised to every waiting caller; a proof the
+    verifier rejects comes back as a report with ok=False.
+    """
+
+    def __init__(self, verifier: Optional[LocalVerifier] = None):
+        self._verifier = verifier
+        self._lock = asyncio.Lock()  # eth-tester is not thread-safe - one batch at a time
+        self._pending = []
+        self._flush_task = None
+        self._flushes = set()  # full batches being checked - referenced until done
+
+    async def _get_verifier(self) -> LocalVerifier:
+        if self._verifier is None:
+            self._verifier = await asyncio.to_thread(LocalVerifier)
+        return self._verifier
+
+    async def check(self, response: tuple) -> PreflightReport:
+        """Pre-flight one submitVerificationResponse argument tuple"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((response, future))
+
+        # The batch is checked in its own task and the wait is shielded, so a cancelled
+        # caller never strands the other callers in its batch
+        if len(self._pending) >= Config.PREFLIGHT_BATCH_SIZE:
+            flush = asyncio.create_task(self._flush())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+        return await asyncio.shield(future)
+
+    async def _flush_later(self):
+        await asyncio.sleep(Config.PREFLIGHT_BATCH_WINDOW)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            async with self._lock:
+                verifier = await self._get_verifier()
+                reports = await asyncio.to_thread(verifier.check_many, [response for response, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        logger.info(f"🧪 Pre-flight checked {len(batch)} proof(s)")
+        for (_, future), report in zip(batch, reports):
+            if not future.done():
+                future.set_result(report)
@@ -0,0 +1,98 @@
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from config import Config
+
+EVENT_PROCESSING = "processing"
+EVENT_DONE = "done"
+EVENT_CANCELLED = "cancelled"
+EVENT_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed_events (
+    request_id INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (request_id, tx_hash)
+);
+"""
+
+
+class ProcessedEvents:
+    """
+    Idempotency index of NewsSubmitted logs keyed by (requestId, transactionHash).
+
+    A log is proven and settled at most once, no matter how often it is
+    redelivered by resubscriptions. Logs removed by a reorg are marked
+    cancelled, which lets the same transaction be processed again if it is
+    re-mined on the new branch. A job that ends without finishing is marked
+    failed, and a log left processing by a process that died counts as
+    failed once it is stale_seconds old - both are retried on redelivery.
+    """
+
+    def __init__(self, path: Optional[str] = None, stale_seconds: Optional[float] = None, clock=time.time):
+        self.path = path or Config.PROCESSED_EVENTS_PATH
+        self.stale_seconds = stale_seconds if stale_seconds is not None else Config.PROCESSING_STALE_SECONDS
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _set(self, request_id: int, tx_hash: str, status: str, where: Optional[str] = None,
+             where_params: tuple = ()) -> bool:
+        sql = ("INSERT INTO processed_events (request_id, tx_hash, status, updated_at) VALUES (?, ?, ?, ?) "
+               "ON CONFLICT (request_id, tx_hash) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at")
+        params = [request_id, tx_hash.lower(), status, self._clock()]
+        if where is not None:
+            sql += f" WHERE {where}"
+            params.extend(where_params)
+        with self._lock:
+            rowcount = self._db.execute(sql, params).rowcount
+            self._db.commit()
+        return rowcount == 1
+
+    def _retryable(self):
+        """WHERE clause matching rows that may be processed (again)"""
+        return ("processed_events.status IN (?, ?) OR "
+                "(processed_events.status = ? AND processed_events.updated_at < ?)",
+                (EVENT_CANCELLED, EVENT_FAILED, EVENT_PROCESSING, self._clock() - self.stale_seconds))
+
+    def status(self, request_id: int, tx_hash: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, updated_at FROM processed_events WHERE request_id = ? AND tx_hash = ?",
+                (request_id, tx_hash.lower())
+            ).fetchone()
+        if row is None:
+            return None
+        status, updated_at = row
+        if status == EVENT_PROCESSING and updated_at < self._clock() - self.stale_seconds:
+            return EVENT_FAILED  # left behind by a process that died mid-job
+        return status
+
+    def seen(self, request_id: int, tx_hash: str) -> bool:
+        """True if this log is being or has been processed"""
+        return self.status(request_id, tx_hash) in (EVENT_PROCESSING, EVENT_DONE)
+
+    def begin(self, request_id: int, tx_hash: str) -> bool:
+        """Claim a log for processing - False if it is being or was already handled"""
+        where, where_params = self._retryable()
+        return self._set(request_id, tx_hash, EVENT_PROCESSING, where, where_params)
+
+    def finish(self, request_id: int, tx_hash: str):
+        self._set(request_id, tx_hash, EVENT_DONE, "processed_events.status = ?", (EVENT_PROCESSING,))
+
+    def fail(self, request_id: int, tx_hash: str):
+        """The job ended without finishing - the log is processed again when it is redelivered"""
+        self._set(request_id, tx_hash, EVENT_FAILED, "processed_events.status = ?", (EVENT_PROCESSING,))
+
+    def cancel(self, request_id: int, tx_hash: str):
+        self._set(request_id, tx_hash, EVENT_CANCELLED)
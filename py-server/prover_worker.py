@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import multiprocessing
+import resource
+from typing import Optional
+
+from config import Config
+from structured_logging import current_context, set_context, setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProverTimeout(Exception):
+    """Raised when a proof exceeds its deadline - the worker process is killed"""
+
+
+class ProverCrashed(Exception):
+    """Raised when the worker process dies mid-job"""
+
+
+# Requests understood by the worker - (kind, *args)
+PROVE = "prove"      # (PROVE, claim, evidence, log context)
+WARM_UP = "warm_up"  # (WARM_UP,) - answered once imports and artifacts are loaded
+EMBED = "embed"      # (EMBED, texts) - batch-encode texts into the embedding cache
+
+
+def worker_main(conn):
+    """
+    Entry point of the prover process. Heavy imports (torch, ezkl) happen here,
+    so all of their memory is returned when the process is recycled.
+    """
+    setup_logging()
+    from minimal_sentence_model import setup_and_verify, warm_up, prefetch_embeddings
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        kind, *args = job
+        try:
+            if kind == WARM_UP:
+                message = ("ok", warm_up())
+            elif kind == EMBED:
+                message = ("ok", prefetch_embeddings(args[0]))
+            else:
+                claim, evidence, context = args
+                set_context(context)  # log under the request that sent the job
+                result = asyncio.run(setup_and_verify(claim, evidence, setup_required=False))
+                message = ("ok", result)
+        except Exception as e:
+            message = ("error", f"{type(e).__name__}: {e}")
+        # Peak RSS of this process in KB (Linux) rides along with every reply
+        conn.send(message + (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,))
+
+
+class ProverProcess:
+    """
+    Runs proofs in a separate process that can be killed and replaced.
+
+    A job that misses its deadline or is cancelled kills the process (the
+    watchdog); the process is also recycled after PROVER_MAX_JOBS jobs or once
+    its RSS passes PROVER_MAX_RSS_MB, so long uptimes do not accumulate
+    torch/ezkl memory. A replaced worker is warmed up again in the background,
+    so the next job does not pay for the imports.
+    """
+
+    def __init__(self, max_jobs: Optional[int] = None, max_rss_mb: Optional[int] = None, target=worker_main):
+        self.max_jobs = max_jobs if max_jobs is not None else Config.PROVER_MAX_JOBS
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else Config.PROVER_MAX_RSS_MB
+        self._target = target
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._jobs = 0
+        self._lock = asyncio.Lock()  # one job at a time - ezkl works on fixed artifact paths
+        self._warm_task = None
+        self.restarts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(target=self._target, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._jobs = 0
+        logger.info(f"🧮 Prover process started (pid {self._process.pid})")
+
+    def kill(self):
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join(timeout=5)
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def stop(self):
+        """Graceful shutdown - falls back to kill if the worker does not exit"""
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+        if self.alive:
+            try:
+                self._conn.send(None)
+                self._process.join(timeout=5)
+            except (OSError, EOFError):
+                pass
+        self.kill()
+
+    def _replace(self, rewarm: bool):
+        self.kill()
+        self.restarts += 1
+        if rewarm:
+            # Runs once the current request releases the lock
+            self._warm_task = asyncio.get_running_loop().create_task(self._rewarm())
+
+    async def _rewarm(self):
+        try:
+            missing = await self.warm_up(Config.WARMUP_TIMEOUT)
+            if missing:
+                logger.warning(f"⚠️ Replacement prover is missing circuit artifacts: {missing}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Could not warm up the replacement prover: {e}")
+
+    def _recycle(self, reason: str, rewarm: bool):
+        # The worker is idle between jobs, so killing it loses nothing
+        logger.info(f"♻️ Recycling prover process: {reason}")
+        self._replace(rewarm)
+
+    async def _receive(self, timeout: float):
+        """Wait for the worker's reply without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        fd = self._conn.fileno()
+
+        def on_readable():
+            if not future.done():
+                future.set_result(None)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            await asyncio.wait_for(future, timeout)
+        finally:
+            loop.remove_reader(fd)
+
+        try:
+            return self._conn.recv()
+        except (EOFError, OSError):
+            raise ProverCrashed("Prover process exited during the job")
+
+    async def verify(self, claim: str, evidence: str, timeout: float):
+        return await self._request((PROVE, claim, evidence, current_context()), timeout)
+
+    async def warm_up(self, timeout: float):
+        """
+        Start the worker and wait until torch, ezkl and the circuit artifacts are loaded.
+        Returns the artifact paths that are missing.
+        """
+        return await self._request((WARM_UP,), timeout, counts_as_job=False, rewarm=False)
+
+    async def embed(self, texts, timeout: float):
+        """Fill the worker's embedding cache for texts that are about to be proven"""
+        return await self._request((EMBED, list(texts)), timeout, counts_as_job=False)
+
+    async def _request(self, job, timeout: float, counts_as_job: bool = True, rewarm: bool = True):
+        async with self._lock:
+            if not self.alive:
+                self.kill()
+                self.start()
+
+            if counts_as_job:
+                self._jobs += 1
+            self._conn.send(job)
+            try:
+                status, payload, rss_kb = await self._receive(timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"⏱️ Prover exceeded {timeout:.0f}s deadline - killing pid {self._process.pid}")
+                self._replace(rewarm)
+                raise ProverTimeout(f"Prover did not answer within {timeout:.0f}s")
+            except (asyncio.CancelledError, ProverCrashed):
+                # The worker is mid-proof with nobody waiting for it - it cannot be reused
+                self._replace(rewarm)
+                raise
+
+            if self._jobs >= self.max_jobs:
+                self._recycle(f"{self._jobs} jobs served", rewarm)
+            elif rss_kb / 1024 > self.max_rss_mb:
+                self._recycle(f"RSS {rss_kb / 1024:.0f} MB above {self.max_rss_mb} MB", rewarm)
+
+            if status == "error":
+                raise RuntimeError(payload)
+            return payload
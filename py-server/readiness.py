@@ -0,0 +1,50 @@
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+STATE_STARTING = "starting"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+
+class Readiness:
+    """
+    Startup progress reported through health_check.
+
+    The server binds and reports "starting" straight away; heavy imports and
+    circuit loading run in a background warm-up whose steps are timed here,
+    and the process only reports "ready" once the prover is hot.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._started = clock()
+        self.state = STATE_STARTING
+        self.steps = {}  # warm-up step -> seconds it took
+        self.error = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == STATE_READY
+
+    @contextmanager
+    def step(self, name: str):
+        began = self._clock()
+        yield
+        self.steps[name] = round(self._clock() - began, 3)
+
+    def mark_ready(self):
+        self.state = STATE_READY
+
+    def mark_failed(self, error: Optional[str]):
+        self.state = STATE_FAILED
+        self.error = error
+
+    def to_dict(self):
+        return {
+            "status": self.state,
+            "ready": self.ready,
+            "uptime_seconds": round(self._clock() - self._started, 3),
+            "warmup": dict(self.steps),
+            "error": self.error,
+        }
@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Priority classes - lower value is served first
+PRIORITY_CHAIN = 0        # NewsSubmitted jobs with on-chain settlement
+PRIORITY_INTERACTIVE = 1  # sentence_verification requests from WebSocket clients
+
+
+class SchedulerBusy(Exception):
+    """Raised when a job is not admitted - carries queue position and ETA for the reply"""
+
+    def __init__(self, reason: str, position: int, eta: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.position = position
+        self.eta = eta
+
+
+class _Job:
+    __slots__ = ("job_fn", "future", "client_id", "enqueued_at", "context")
+
+    def __init__(self, job_fn, future, client_id):
+        self.job_fn = job_fn
+        self.future = future
+        self.client_id = client_id
+        self.enqueued_at = time.monotonic()
+        # The job runs in the submitter's context, so its logs carry the request fields
+        self.context = contextvars.copy_context()
+
+
+class ProofScheduler:
+    """
+    Central scheduler in front of the prover.
+
+    Chain jobs are always admitted and always served before interactive jobs.
+    Interactive jobs are bounded by a global queue length and a per-client quota,
+    and are served round-robin across clients so one chatty client cannot crowd out others.
+    """
+
+    def __init__(self, max_queue: Optional[int] = None, client_quota: Optional[int] = None,
+                 workers: Optional[int] = None, initial_eta: Optional[float] = None):
+        self.max_queue = max_queue if max_queue is not None else Config.SCHEDULER_MAX_QUEUE
+        self.client_quota = client_quota if client_quota is not None else Config.SCHEDULER_CLIENT_QUOTA
+        self.workers = workers if workers is not None else Config.SCHEDULER_WORKERS
+        self.avg_job_seconds = initial_eta if initial_eta is not None else Config.SCHEDULER_INITIAL_ETA
+
+        self._chain = deque()
+        self._interactive = OrderedDict()  # client_id -> deque of jobs, rotated for round-robin
+        self._interactive_count = 0
+        self._running = 0
+        self._wakeup = None
+        self._worker_tasks = []
+
+    def start(self):
+        """Start worker tasks - must be called from within the running event loop"""
+        if self._worker_tasks:
+            return
+        self._wakeup = asyncio.Condition()
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"🗂️ Proof scheduler started with {self.workers} worker(s)")
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def queue_length(self) -> int:
+        return len(self._chain) + self._interactive_count
+
+    def client_pending(self, client_id) -> int:
+        jobs = self._interactive.get(client_id)
+        return len(jobs) if jobs else 0
+
+    def eta(self, position: int) -> float:
+        """Estimated seconds until a job at the given queue position completes"""
+        rounds = (position + self._running + self.workers - 1) // self.workers
+        return round(rounds * self.avg_job_seconds, 2)
+
+    def admit(self, priority: int, client_id=None) -> int:
+        """Check admission without enqueueing - returns the position the job would take"""
+        if priority == PRIORITY_CHAIN:
+            return len(self._chain) + 1
+
+        position = self.queue_length() + 1
+        if self._interactive_count >= self.max_queue:
+            raise SchedulerBusy("queue full", position, self.eta(position))
+        if self.client_pending(client_id) >= self.client_quota:
+            raise SchedulerBusy("client quota exceeded", position, self.eta(position))
+        return position
+
+    async def submit(self, priority: int, job_fn: Callable[[], Awaitable[Any]], client_id=None,
+                     on_queued: Optional[Callable[[int, float], Awaitable[None]]] = None) -> Any:
+        """
+        Queue a job and wait for its result.
+        Raises SchedulerBusy immediately if the job is not admitted.
+        """
+        if self._wakeup is None:
+            self.start()
+
+        position = self.admit(priority, client_id)
+        job = _Job(job_fn, asyncio.get_running_loop().create_future(), client_id)
+
+        if priority == PRIORITY_CHAIN:
+            self._chain.append(job)
+        else:
+            self._interactive.setdefault(client_id, deque()).append(job)
+            self._interactive_count += 1
+
+        async with self._wakeup:
+            self._wakeup.notify()
+
+        try:
+            if on_queued is not None:
+                await on_queued(position, self.eta(position))
+            return await job.future
+        except BaseException:
+            # Caller cancelled or its queued notice failed (client gone) - nobody will read
+            # the result, so the job must not reach the prover
+            self._withdraw(job, priority)
+            job.future.cancel()
+            raise
+
+    def _withdraw(self, job: _Job, priority: int):
+        """Take a job that has not started yet out of its queue - frees its quota slot"""
+        if priority == PRIORITY_CHAIN:
+            if job in self._chain:
+                self._chain.remove(job)
+            return
+        jobs = self._interactive.get(job.client_id)
+        if jobs is not None and job in jobs:
+            jobs.remove(job)
+            self._interactive_count -= 1
+            if not jobs:
+                del self._interactive[job.client_id]
+
+    def _next_job(self) -> Optional[_Job]:
+        if self._chain:
+            return self._chain.popleft()
+        if not self._interactive:
+            return None
+
+        # Round-robin: take from the first client, then move it to the back
+        client_id, jobs = next(iter(self._interactive.items()))
+        job = jobs.popleft()
+        self._interactive_count -= 1
+        if jobs:
+            self._interactive.move_to_end(client_id)
+        else:
+            del self._interactive[client_id]
+        return job
+
+    async def _worker(self):
+        while True:
+            async with self._wakeup:
+                job = self._next_job()
+                while job is None:
+                    await self._wakeup.wait()
+                    job = self._next_job()
+
+            if job.future.cancelled():
+                continue
+
+            self._running += 1
+            started = time.monotonic()
+            # The job runs as its own task, so a caller giving up (deadline, reorg) cancels
+            # the work itself - a prover job then kills its worker instead of running on
+            task = asyncio.create_task(job.job_fn(), context=job.context)
+            job.future.add_done_callback(lambda future, task=task: future.cancelled() and task.cancel())
+            try:
+                result = await task
+                if not job.future.done():
+                    job.future.set_result(result)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    # The scheduler is stopping - take the job down with it
+                    task.cancel()
+                    if not job.future.done():
+                        job.future.cancel()
+                    raise
+                # Only this job was cancelled - keep serving the queue
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                self._running -= 1
+                # Exponential moving average of service time feeds the ETA estimate
+                elapsed = time.monotonic() - started
+                self.avg_job_seconds = 0.8 * self.avg_job_seconds + 0.2 * elapsed
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_keys(keys) -> List[str]:
+    keys = [key.strip() for key in keys if key and key.strip()]
+    return [key if key.startswith('0x') else f"0x{key}" for key in keys]
+
+
+def load_private_keys() -> List[str]:
+    """
+    Verifier account keys from VERIFIER_PRIVATE_KEYS (comma separated),
+    falling back to the single PRIVATE_KEY account
+    """
+    raw = Config.VERIFIER_PRIVATE_KEYS or os.getenv('PRIVATE_KEY') or ''
+    keys = normalize_keys(raw.split(','))
+    if not keys:
+        raise ValueError("PRIVATE_KEY or VERIFIER_PRIVATE_KEYS must be set in environment variables")
+    return keys
+
+
+# Accounts of every pool on the same RPC endpoint - one nonce stream per (endpoint, address)
+_shared_signers: Dict[tuple, "SignerAccount"] = {}
+
+
+class SignerAccount:
+    """One verifier account with its own local nonce stream"""
+    __slots__ = ("account", "nonce", "in_flight", "balance", "sent")
+
+    def __init__(self, account):
+        self.account = account
+        self.nonce = None       # next nonce to use - None means resync from the chain
+        self.in_flight = 0      # transactions sent but not yet mined
+        self.balance = None     # last observed balance in wei
+        self.sent = 0
+
+    @property
+    def address(self):
+        return self.account.address
+
+    @property
+    def low_balance(self) -> bool:
+        return self.balance is not None and self.balance < Config.SIGNER_MIN_BALANCE_WEI
+
+
+def shared_signer(account, chain_id: Optional[int] = None) -> SignerAccount:
+    """
+    The SignerAccount for an account on a chain. Pools of targets on the same
+    chain get the same object - even through different RPC endpoints - so
+    they draw nonces from one counter instead of colliding.
+    """
+    if chain_id is None:
+        return SignerAccount(account)
+    key = (chain_id, account.address)
+    signer = _shared_signers.get(key)
+    if signer is None:
+        signer = _shared_signers[key] = SignerAccount(account)
+    return signer
+
+
+class SignerSlot:
+    """An account reserved by SignerPool.acquire() - the nonce is taken on demand"""
+    __slots__ = ("_pool", "_signer", "nonce")
+
+    def __init__(self, pool, signer: SignerAccount):
+        self._pool = pool
+        self._signer = signer
+        self.nonce = None
+
+    @property
+    def account(self):
+        return self._signer.account
+
+    async def take_nonce(self) -> int:
+        if self.nonce is None:
+            self.nonce = await self._pool._next_nonce(self._signer)
+        return self.nonce
+
+
+class SignerPool:
+    """
+    Pool of verifier accounts used to settle results in parallel.
+
+    Each result goes to the least-loaded account with enough balance, and
+    every account keeps its own nonce stream, so a stuck transaction only
+    delays the results queued on that one account. Pools built with the same
+    chain_id share the stream of any account they have in common.
+    """
+
+    def __init__(self, web3, private_keys: Optional[List[str]] = None, chain_id: Optional[int] = None):
+        self.web3 = web3
+        keys = normalize_keys(private_keys) if private_keys else load_private_keys()
+        self.signers = [shared_signer(web3.eth.account.from_key(key), chain_id) for key in dict.fromkeys(keys)]
+        self._monitor_task = None
+        logger.info(f"🔑 Signer pool loaded {len(self.signers)} account(s): "
+                    f"{', '.join(s.address for s in self.signers)}")
+
+    def __len__(self):
+        return len(self.signers)
+
+    def pick(self) -> SignerAccount:
+        """Least-loaded account, preferring accounts that are not low on balance"""
+        funded = [s for s in self.signers if not s.low_balance]
+        candidates = funded or self.signers
+        return min(candidates, key=lambda s: (s.in_flight, s.sent))
+
+    async def _next_nonce(self, signer: SignerAccount) -> int:
+        if signer.nonce is None:
+            count = await asyncio.to_thread(self.web3.eth.get_transaction_count, signer.address, 'pending')
+            # Another transaction may have synced it meanwhile - its nonce is already in use
+            if signer.nonce is None:
+                signer.nonce = count
+        nonce = signer.nonce
+        signer.nonce += 1
+        return nonce
+
+    async def sync_nonces(self):
+        """Fetch nonces for accounts that need a resync, off the event loop"""
+        stale = [s for s in self.signers if s.nonce is None]
+        if not stale:
+            return
+        counts = await asyncio.to_thread(
+            lambda: [self.web3.eth.get_transaction_count(s.address, 'pending') for s in stale]
+        )
+        for signer, count in zip(stale, counts):
+            if signer.nonce is None:
+                signer.nonce = count
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Reserve an account for one transaction. Its nonce is only taken once
+        the steps that may fail before sending - gas estimation - are done,
+        so a failed estimate never leaves a gap in the nonce stream:
+
+            async with pool.acquire() as slot:
+                gas = ...estimate_gas({'from': slot.account.address})
+                nonce = await slot.take_nonce()
+                ...
+        """
+        signer = self.pick()
+        slot = SignerSlot(self, signer)
+        signer.in_flight += 1
+        signer.sent += 1
+        try:
+            yield slot
+        except Exception:
+            # A taken nonce may or may not have been consumed - resync before the next use
+            if slot.nonce is not None:
+                signer.nonce = None
+            raise
+        finally:
+            signer.in_flight -= 1
+
+    def refresh_balances(self):
+        """Blocking - run it in a thread"""
+        for signer in self.signers:
+            try:
+                signer.balance = self.web3.eth.get_balance(signer.address)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not fetch balance for {signer.address}: {e}")
+                continue
+            if signer.low_balance:
+                logger.warning(f"⚠️ Verifier account {signer.address} is low on funds: {signer.balance} wei")
+
+    def start_monitoring(self):
+        if self._monitor_task is None:
+            self._monitor_task = asyncio.create_task(self._monitor())
+
+    def stop_monitoring(self):
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+
+    async def _monitor(self):
+        while True:
+            await asyncio.to_thread(self.refresh_balances)
+            await asyncio.sleep(Config.SIGNER_BALANCE_INTERVAL)
+
+    def status(self):
+        return [
+            {
+                "address": s.address,
+                "in_flight": s.in_flight,
+                "balance": s.balance,
+                "low_balance": s.low_balance,
+            }
+            for s in self.signers
+        ]
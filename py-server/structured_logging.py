@@ -0,0 +1,142 @@
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from config import Config
+
+# Fields of the request being handled - set per task, so concurrent jobs never mix
+_context = contextvars.ContextVar("log_context", default={})
+
+_listener = None
+
+
+def truncate(value, limit: Optional[int] = None):
+    """Cut long strings down to limit characters, noting how much was dropped"""
+    limit = limit if limit is not None else Config.LOG_MAX_FIELD_CHARS
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}…(+{len(value) - limit} chars)"
+    return value
+
+
+def bind(**fields):
+    """
+    Attach fields (request_id, content_hash, target, ...) to every record logged
+    from the current task. Whether the task's DEBUG records are kept is decided
+    once here, so a sampled request keeps all of its debug output.
+    """
+    context = dict(_context.get())
+    context.update(fields)
+    if "_sampled" not in context:
+        context["_sampled"] = random.random() < Config.LOG_DEBUG_SAMPLE_RATE
+    _context.set(context)
+
+
+def current_context() -> dict:
+    """Context of the current task, for handing to another process"""
+    return dict(_context.get())
+
+
+def set_context(context: dict):
+    """Replace the current context - used by the prover worker for each job"""
+    _context.set(dict(context))
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request context"""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", None) or {})
+        for key, value in (getattr(record, "fields", None) or {}).items():
+            entry[key] = truncate(value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the writer thread. Only the cheap work happens on the
+    caller's thread: message interpolation, truncation and capturing the
+    request context. A full queue drops the record instead of waiting.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        context = _context.get()
+        if record.levelno <= logging.DEBUG and not context.get("_sampled", True):
+            return None
+        message = truncate(record.getMessage())
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        record.context = {k: v for k, v in context.items() if not k.startswith("_")}
+        return record
+
+    def emit(self, record):
+        try:
+            prepared = self.prepare(record)
+            if prepared is not None:
+                self.enqueue(prepared)
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+
+def setup_logging(level: Optional[str] = None):
+    """
+    Route all logging through a bounded queue to a background writer thread.
+    LOG_FORMAT=json (default) emits structured records, LOG_FORMAT=text the classic format.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if Config.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    log_queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_NonBlockingQueueHandler(log_queue))
+    root.setLevel(level or Config.LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush everything queued so far and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """Records discarded because the queue was full"""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _NonBlockingQueueHandler):
+            return handler.dropped
+    return 0
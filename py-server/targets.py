@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+from typing import List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_NAME = "default"
+
+
+def load_contract(web3, address: str, abi_path: str):
+    """Contract instance for a PolkaNews deployment"""
+    try:
+        with open(abi_path, 'r') as f:
+            contract_abi = json.load(f)
+    except FileNotFoundError:
+        raise Exception(f"Contract ABI file not found: {abi_path}")
+    except json.JSONDecodeError:
+        raise Exception(f"Invalid JSON in contract ABI file: {abi_path}")
+
+    return web3.eth.contract(address=address, abi=contract_abi)
+
+
+def target_path(base: str, name: str) -> str:
+    """Per-target variant of a local store path - the default target keeps the configured path"""
+    if not base or name == DEFAULT_TARGET_NAME:
+        return base
+    root, ext = os.path.splitext(base)
+    return f"{root}.{name}{ext}"
+
+
+class ChainTarget:
+    """
+    One PolkaNews deployment served by this process.
+
+    Each target has its own RPC connections, log subscription, confirmation
+    queue, news index, fleet store and signer pool; the prover, scheduler and
+    feed are shared by all targets.
+    """
+
+    def __init__(self, name: str, ws_uri: str, http_uri: str, contract_address: str,
+                 abi_path: Optional[str] = None, private_keys: Optional[List[str]] = None):
+        self.name = name
+        self.ws_uri = ws_uri
+        self.http_uri = http_uri
+        self.contract_address = contract_address
+        self.abi_path = abi_path or Config.CONTRACT_ABI_PATH
+        self.private_keys = private_keys
+        self.news_index_path = target_path(Config.NEWS_INDEX_PATH, name)
+        self.fleet_store_path = target_path(Config.FLEET_STORE_PATH, name)
+
+        # Runtime state, filled in by the server on startup
+        self.web3 = None
+        self.contract = None
+        self.confirmations = None
+        self.listener = None
+        self.news_index = None
+        self.fleet = None
+        self.articles = None  # batched getNewsArticles reads
+        self.job_tasks = {}  # (requestId, transactionHash) -> running task, cancelled if its log is removed
+        self.tasks = []  # monitoring and sweeper tasks, cancelled when the target is stopped
+
+    def __repr__(self):
+        return f"ChainTarget({self.name!r}, {self.contract_address})"
+
+    def connect(self):
+        """HTTP connection and contract instance for reads"""
+        from web3 import Web3
+
+        self.web3 = Web3(Web3.HTTPProvider(self.http_uri))
+        self.contract = load_contract(self.web3, self.contract_address, self.abi_path)
+        return self
+
+
+def load_targets() -> List[ChainTarget]:
+    """
+    Targets from the JSON file at TARGETS_PATH, e.g.
+
+        [{"name": "moonbase", "ws_uri": "wss://...", "http_uri": "https://...",
+          "contract_address": "0x...", "private_keys": ["0x..."]}]
+
+    or a single default target built from WEB3_WS_URI / WEB3_HTTP_URI / CONTRACT_ADDRESS
+    """
+    if not Config.TARGETS_PATH:
+        return [ChainTarget(DEFAULT_TARGET_NAME, Config.WEB3_WS_URI, Config.WEB3_HTTP_URI, Config.CONTRACT_ADDRESS)]
+
+    with open(Config.TARGETS_PATH, 'r') as f:
+        entries = json.load(f)
+
+    targets = []
+    for entry in entries:
+        try:
+            targets.append(ChainTarget(
+                entry['name'],
+                entry['ws_uri'],
+                entry['http_uri'],
+                entry['contract_address'],
+                abi_path=entry.get('abi_path'),
+                private_keys=entry.get('private_keys'),
+            ))
+        except KeyError as e:
+            raise ValueError(f"Target entry in {Config.TARGETS_PATH} is missing {e}")
+
+    names = [target.name for target in targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate target names in {Config.TARGETS_PATH}: {names}")
+    if not targets:
+        raise ValueError(f"No targets defined in {Config.TARGETS_PATH}")
+    return targets
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch verification API - validation, batch deduplication and streaming
+No prover or HTTP server needed: proving is a plain coroutine
+"""
+import asyncio
+
+import pytest
+
+import batch_api
+from batch_api import BatchVerifier, parse_batch, start_http_api, is_loopback, authorized
+from scheduler import ProofScheduler, PRIORITY_INTERACTIVE
+from verification_result import VerificationResult
+
+
+def collect(verifier, items):
+    async def run():
+        lines = [line async for line in verifier.run(items, client_id="batch:test")]
+        await verifier.scheduler.stop()
+        return lines
+    return asyncio.run(run())
+
+
+def test_duplicates_are_proven_once_and_reported_for_every_item():
+    proven = []
+
+    async def prove(claim, evidence):
+        proven.append(claim)
+        return VerificationResult(True, 1, b"\x01", [1])
+
+    async def fetch_claim(cid):
+        return {"QmA": "sky is blue"}[cid]
+
+    items = parse_batch({"items": [
+        {"id": "a", "claim": "sky is blue", "evidence": "e"},
+        {"id": "b", "claim": "sky is blue", "evidence": "e"},
+        {"id": "c", "cid": "QmA", "evidence": "e"},
+        {"id": "d", "claim": "sky is blue", "evidence": "other"},
+    ]})
+    verifier = BatchVerifier(ProofScheduler(max_queue=10, client_quota=10), prove, fetch_claim, concurrency=2)
+    lines = collect(verifier, items)
+
+    assert sorted(line["id"] for line in lines) == ["a", "b", "c", "d"]
+    assert all(line["status"] == "ok" for line in lines)
+    assert lines[0]["result"]["proof"] == "0x01"
+    # a and b share one proof; c is keyed by CID and d has different evidence
+    assert len(proven) == 3
+
+
+def test_item_errors_do_not_fail_the_batch():
+    async def prove(claim, evidence):
+        if claim == "bad":
+            raise RuntimeError("prover exploded")
+        return VerificationResult(True, 0, b"\x00", [0])
+
+    async def fetch_claim(cid):
+        return ""
+
+    items = parse_batch({"items": [
+        {"id": 1, "claim": "bad", "evidence": "e"},
+        {"id": 2, "cid": "QmEmpty", "evidence": "e"},
+        {"id": 3, "claim": "good", "evidence": "e"},
+    ]})
+    verifier = BatchVerifier(ProofScheduler(max_queue=10, client_quota=10), prove, fetch_claim, concurrency=3)
+    statuses = {line["id"]: line["status"] for line in collect(verifier, items)}
+    assert statuses == {1: "error", 2: "error", 3: "ok"}
+
+
+def test_batch_concurrency_stays_within_client_quota():
+    in_flight, peak = 0, 0
+
+    async def prove(claim, evidence):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return VerificationResult(True, 1, b"\x01", [1])
+
+    items = parse_batch({"items": [{"claim": f"claim {i}", "evidence": "e"} for i in range(20)]})
+    scheduler = ProofScheduler(max_queue=10, client_quota=2, workers=4)
+    verifier = BatchVerifier(scheduler, prove, None, concurrency=2)
+    lines = collect(verifier, items)
+    assert len(lines) == 20 and all(line["status"] == "ok" for line in lines)
+    assert peak <= 2
+
+
+@pytest.mark.parametrize("payload", [
+    [],
+    {"items": []},
+    {"items": [{"claim": "x"}]},
+    {"items": [{"claim": "x", "cid": "Qm", "evidence": "e"}]},
+    {"items": ["x"]},
+])
+def test_invalid_batches_are_rejected(payload):
+    with pytest.raises(ValueError):
+        parse_batch(payload)
+
+
+def test_batch_size_limit():
+    with pytest.raises(ValueError):
+        parse_batch({"items": [{"claim": "x", "evidence": "e"}] * 3}, max_items=2)
+
+
+def test_prefetch_gets_unique_inline_texts():
+    prefetched = []
+
+    async def prove(claim, evidence):
+        return VerificationResult(True, 1, b"\x01", [1])
+
+    async def prefetch(texts):
+        prefetched.extend(texts)
+
+    items = parse_batch({"items": [
+        {"claim": "a", "evidence": "e"},
+        {"claim": "a", "evidence": "e"},
+        {"claim": "b", "evidence": "e"},
+        {"cid": "QmA", "evidence": "f"},
+    ]})
+    scheduler = ProofScheduler(max_queue=10, client_quota=10)
+    submitted = []
+    submit = scheduler.submit
+
+    def record(priority, job_fn, client_id=None):
+        submitted.append((priority, client_id))
+        return submit(priority, job_fn, client_id=client_id)
+
+    scheduler.submit = record
+    verifier = BatchVerifier(scheduler, prove, lambda cid: asyncio.sleep(0, "c"), concurrency=1, prefetch=prefetch)
+    assert len(collect(verifier, items)) == 4
+    assert prefetched == ["a", "e", "b"]
+    # Encoding is scheduled like the proofs - three unique items plus one prefetch chunk
+    assert submitted == [(PRIORITY_INTERACTIVE, "batch:test")] * 4
+
+
+def test_loopback_hosts():
+    assert all(is_loopback(host) for host in ("localhost", "127.0.0.1", "::1"))
+    assert not any(is_loopback(host) for host in ("0.0.0.0", "10.0.0.5", "api.example.com"))
+
+
+def test_public_api_needs_a_token(monkeypatch):
+    monkeypatch.setattr(batch_api.Config, "BATCH_API_TOKEN", "")
+    verifier = BatchVerifier(ProofScheduler(), None, None)
+    with pytest.raises(ValueError, match="BATCH_API_TOKEN"):
+        asyncio.run(start_http_api(verifier, host="0.0.0.0", port=1))
+
+
+def test_bearer_token_check(monkeypatch):
+    monkeypatch.setattr(batch_api.Config, "BATCH_API_TOKEN", "s3cret")
+    assert authorized("Bearer s3cret")
+    assert not any(authorized(header) for header in (None, "", "Bearer s3cre", "Bearer s3cret ", "s3cret"))
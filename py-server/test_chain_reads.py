@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for shared chain reads - single-flight caching and batched article lookups
+A fake contract stands in for web3
+"""
+import asyncio
+import threading
+
+import pytest
+
+from chain_reads import ArticleLookup, SharedRead
+
+
+class FakeCall:
+    def __init__(self, contract, start, count):
+        self.contract, self.start, self.count = contract, start, count
+
+    def call(self):
+        self.contract.calls.append((self.start, self.count))
+        if self.contract.fail:
+            raise RuntimeError("rpc down")
+        articles = self.contract.articles[self.start:self.start + self.count]
+        return [(i, f"Qm{i}", "0xreporter", 1000 + i) for i in articles]
+
+
+class FakeFunctions:
+    def __init__(self, contract):
+        self.contract = contract
+
+    def getNewsArticles(self, start, count):
+        return FakeCall(self.contract, start, count)
+
+
+class FakeContract:
+    def __init__(self, news_count):
+        self.articles = list(range(1, news_count + 1))  # request IDs start at 1
+        self.calls = []
+        self.fail = False
+        self.functions = FakeFunctions(self)
+
+
+def test_article_lookups_are_coalesced_into_range_reads():
+    contract = FakeContract(news_count=100)
+
+    async def run():
+        lookup = ArticleLookup(contract, window=0.01, max_gap=4)
+        return await asyncio.gather(*(lookup.get(i) for i in (3, 5, 4, 5, 40, 200)))
+
+    articles = asyncio.run(run())
+    assert [a.content_hash if a else None for a in articles] == ["Qm3", "Qm5", "Qm4", "Qm5", "Qm40", None]
+    assert articles[4].timestamp == 1040
+    # 3..5 in one read, 40 and 200 each on their own
+    assert sorted(contract.calls) == [(2, 3), (39, 1), (199, 1)]
+
+
+def test_article_lookup_errors_reach_every_waiter():
+    contract = FakeContract(news_count=10)
+    contract.fail = True
+
+    async def run():
+        lookup = ArticleLookup(contract, window=0.01)
+        return await asyncio.gather(lookup.get(1), lookup.get(2), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(contract.calls) == 1
+
+
+def test_shared_read_is_single_flight_and_cached():
+    calls = []
+    release = threading.Event()
+
+    def read():
+        calls.append(1)
+        release.wait(1)
+        return len(calls)
+
+    now = [0.0]
+
+    async def run():
+        shared = SharedRead(read, ttl=5, clock=lambda: now[0])
+        waiters = [asyncio.create_task(shared.get()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        first = await asyncio.gather(*waiters)
+        cached = await shared.get()
+        now[0] = 10.0
+        refreshed = await shared.get()
+        return first, cached, refreshed
+
+    first, cached, refreshed = asyncio.run(run())
+    assert first == [1, 1, 1] and cached == 1
+    assert refreshed == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_read():
+    async def run():
+        shared = SharedRead(lambda: "sources", ttl=5)
+        cancelled = asyncio.create_task(shared.get())
+        other = asyncio.create_task(shared.get())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await other
+
+    assert asyncio.run(run()) == "sources"
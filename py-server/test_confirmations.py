@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for reorg handling - confirmation depth and the idempotency index
+A fake chain stands in for web3
+"""
+import asyncio
+from confirmations import ConfirmationQueue
+from processed_events import ProcessedEvents
+
+
+class FakeEth:
+    def __init__(self):
+        self.block_number = 100
+        self.hashes = {}
+
+    def get_block(self, number):
+        return {"hash": self.hashes.get(number, f"0x{number:064x}")}
+
+
+class FakeWeb3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+def test_logs_released_after_depth_on_canonical_chain():
+    async def run():
+        web3 = FakeWeb3()
+        released = []
+
+        async def on_confirmed(key, payload):
+            released.append(key)
+
+        queue = ConfirmationQueue(web3, on_confirmed, depth=2, poll_interval=60)
+        await queue.add((1, "0xa"), hex(100), f"0x{100:064x}", {})
+        await queue.add((2, "0xb"), 100, "0xorphaned", {})
+        await queue.add((3, "0xc"), 101, f"0x{101:064x}", {})
+
+        await queue.release_confirmed()
+        assert released == []
+        web3.eth.block_number = 102
+        await queue.release_confirmed()
+        return released, len(queue)
+
+    released, remaining = asyncio.run(run())
+    assert released == [(1, "0xa")]
+    assert remaining == 1
+
+
+def test_discarded_log_is_never_released():
+    async def run():
+        web3 = FakeWeb3()
+        released = []
+
+        async def on_confirmed(key, payload):
+            released.append(key)
+
+        queue = ConfirmationQueue(web3, on_confirmed, depth=1, poll_interval=60)
+        await queue.add((1, "0xa"), 100, f"0x{100:064x}", {})
+        assert queue.discard((1, "0xa"))
+        web3.eth.block_number = 200
+        await queue.release_confirmed()
+        return released
+
+    assert asyncio.run(run()) == []
+
+
+def test_stopped_queue_releases_nothing():
+    async def run():
+        web3 = FakeWeb3()
+        released = []
+
+        async def on_confirmed(key, payload):
+            released.append(key)
+
+        queue = ConfirmationQueue(web3, on_confirmed, depth=1, poll_interval=0.01)
+        queue.start()
+        await queue.add((1, "0xa"), 100, f"0x{100:064x}", {})
+        queue.stop()
+        web3.eth.block_number = 200
+        await asyncio.sleep(0.05)
+        return released, len(queue)
+
+    assert asyncio.run(run()) == ([], 0)
+
+
+def test_processed_events_are_idempotent():
+    events = ProcessedEvents(":memory:")
+    assert events.begin(1, "0xAA")
+    assert not events.begin(1, "0xaa")
+    assert events.seen(1, "0xaa")
+    events.finish(1, "0xaa")
+    assert not events.begin(1, "0xaa")
+
+    # A removed log may be processed again once it is re-mined
+    events.cancel(2, "0xbb")
+    assert not events.seen(2, "0xbb")
+    assert events.begin(2, "0xbb")
+    assert events.begin(2, "0xcc")  # same request, different transaction
+
+
+def test_unfinished_jobs_are_retried():
+    now = [1000.0]
+    events = ProcessedEvents(":memory:", stale_seconds=60, clock=lambda: now[0])
+
+    # A job that raised or was cancelled is marked failed and may run again
+    assert events.begin(1, "0xaa")
+    events.fail(1, "0xaa")
+    assert not events.seen(1, "0xaa")
+    assert events.begin(1, "0xaa")
+
+    # A process that died left the row processing - retryable once it is stale
+    assert events.begin(2, "0xbb")
+    now[0] += 30
+    assert events.seen(2, "0xbb") and not events.begin(2, "0xbb")
+    now[0] += 31
+    assert not events.seen(2, "0xbb")
+    assert events.begin(2, "0xbb")
+
+    # fail() never overrides a finished or reorg-cancelled log
+    events.finish(2, "0xbb")
+    events.fail(2, "0xbb")
+    assert events.status(2, "0xbb") == "done"
+    events.cancel(3, "0xcc")
+    events.fail(3, "0xcc")
+    assert events.status(3, "0xcc") == "cancelled"
+
+
+if __name__ == "__main__":
+    test_logs_released_after_depth_on_canonical_chain()
+    test_discarded_log_is_never_released()
+    test_processed_events_are_idempotent()
+    test_unfinished_jobs_are_retried()
+    print("🎉 ALL CONFIRMATION TESTS PASSED!")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the semantic similarity feature - memory-mapped cache and batched encoding
+A fake encoder stands in for sentence-transformers
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from embeddings import EmbeddingCache, SemanticSimilarity, text_key
+
+
+class FakeModel:
+    """Deterministic unit vectors per text; records every encode call"""
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size, convert_to_numpy, normalize_embeddings, show_progress_bar):
+        self.calls.append(list(texts))
+        vectors = []
+        for text in texts:
+            rng = np.random.default_rng(int.from_bytes(text_key(text)[:4], "big"))
+            vector = rng.normal(size=self.dim).astype(np.float32)
+            vectors.append(vector / np.linalg.norm(vector))
+        return np.stack(vectors)
+
+
+def test_cache_persists_and_grows(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = EmbeddingCache(path, dim=4, initial_rows=2)
+    for i in range(5):
+        cache.put(text_key(f"text {i}"), np.full(4, i, dtype=np.float32))
+    cache.flush()
+    assert len(cache) == 5
+
+    reopened = EmbeddingCache(path, dim=4, initial_rows=2)
+    assert len(reopened) == 5
+    assert reopened.get(text_key("text 3")).tolist() == [3.0] * 4
+    assert reopened.get(text_key("missing")) is None
+
+
+def test_cache_rejects_other_dimension(tmp_path):
+    path = str(tmp_path / "cache")
+    EmbeddingCache(path, dim=4, initial_rows=8)
+    with pytest.raises(ValueError):
+        EmbeddingCache(path, dim=6, initial_rows=8)
+
+
+def test_texts_are_encoded_once_in_one_batch(tmp_path):
+    model = FakeModel()
+    semantic = SemanticSimilarity("fake", cache_path=str(tmp_path / "cache"), model=model)
+
+    scores = semantic.similarities([("claim a", "evidence"), ("claim b", "evidence")])
+    assert model.calls == [["claim a", "evidence", "claim b"]]
+    assert all(0.0 <= score <= 1.0 for score in scores)
+
+    assert semantic.similarities([("claim a", "claim a")]) == [pytest.approx(1.0)]
+    assert semantic.similarities([("claim b", "evidence")]) == [pytest.approx(scores[1])]
+    assert len(model.calls) == 1  # everything after the first batch was a cache hit
+
+
+def test_cache_survives_restart(tmp_path):
+    SemanticSimilarity("fake", cache_path=str(tmp_path / "cache"), model=FakeModel()).embed(["a", "b"])
+    model = FakeModel()
+    SemanticSimilarity("fake", cache_path=str(tmp_path / "cache"), model=model).embed(["a", "b", "c"])
+    assert model.calls == [["c"]]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the verification feed - fan-out, bounded buffers and dropping slow subscribers
+Fake websockets record what they were sent
+"""
+import asyncio
+import json
+
+from websockets.exceptions import ConnectionClosed
+
+from feed import VerificationFeed, DROPPED_NOTICE, EVENT_SUBMITTED, EVENT_SETTLED
+
+
+class FakeWebSocket:
+    def __init__(self, gate=None):
+        self.sent = []
+        self.gate = gate  # a slow client - send() waits until the gate opens
+
+    async def send(self, message):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(message)
+
+
+class ClosedWebSocket:
+    async def send(self, message):
+        raise ConnectionClosed(None, None)
+
+
+def test_events_fan_out_to_every_subscriber():
+    async def run():
+        feed = VerificationFeed(buffer_size=8)
+        clients = [FakeWebSocket(), FakeWebSocket()]
+        for websocket in clients:
+            feed.subscribe(websocket)
+        feed.subscribe(clients[0])  # subscribing twice changes nothing
+
+        feed.publish(EVENT_SUBMITTED, 1, "Qm1", target="default")
+        feed.publish(EVENT_SETTLED, 1, "Qm1", isVerified=True)
+        await asyncio.sleep(0.01)
+        return feed, [[json.loads(m) for m in websocket.sent] for websocket in clients]
+
+    feed, received = asyncio.run(run())
+    assert len(feed) == 2
+    for messages in received:
+        assert [m["event"] for m in messages] == [EVENT_SUBMITTED, EVENT_SETTLED]
+        assert messages[0]["requestId"] == 1 and messages[0]["contentHash"] == "Qm1"
+        assert messages[0]["target"] == "default" and messages[1]["isVerified"] is True
+
+
+def test_slow_subscriber_is_dropped_and_told():
+    async def run():
+        feed = VerificationFeed(buffer_size=2)
+        gate = asyncio.Event()
+        slow, fast = FakeWebSocket(gate), FakeWebSocket()
+        feed.subscribe(slow)
+        feed.subscribe(fast)
+
+        # The slow client is stuck in send() on the first event, so two more fill its buffer
+        for request_id in range(1, 5):
+            feed.publish(EVENT_SUBMITTED, request_id)
+            await asyncio.sleep(0)
+        subscribed = (feed.is_subscribed(slow), feed.is_subscribed(fast))
+
+        feed.publish(EVENT_SUBMITTED, 5)  # never queued for the dropped client
+        gate.set()
+        await asyncio.sleep(0.01)
+        return subscribed, slow.sent, fast.sent
+
+    subscribed, slow_sent, fast_sent = asyncio.run(run())
+    assert subscribed == (False, True)
+    # Whatever was in flight, then the notice instead of the backlog
+    assert [json.loads(m)["requestId"] for m in slow_sent[:-1]] == [1]
+    assert slow_sent[-1] == DROPPED_NOTICE
+    assert json.loads(DROPPED_NOTICE)["type"] == "feed_dropped"
+    assert [json.loads(m)["requestId"] for m in fast_sent] == [1, 2, 3, 4, 5]
+
+
+def test_closed_connection_unsubscribes():
+    async def run():
+        feed = VerificationFeed(buffer_size=4)
+        feed.subscribe(ClosedWebSocket())
+        feed.publish(EVENT_SUBMITTED, 1)
+        await asyncio.sleep(0.01)
+        return len(feed)
+
+    assert asyncio.run(run()) == 0
+
+
+if __name__ == "__main__":
+    test_events_fan_out_to_every_subscriber()
+    test_slow_subscriber_is_dropped_and_told()
+    test_closed_connection_unsubscribes()
+    print("🎉 ALL FEED TESTS PASSED!")
+
+
+def test_settlement_is_announced_once():
+    async def run():
+        feed = VerificationFeed(buffer_size=8)
+        websocket = FakeWebSocket()
+        feed.subscribe(websocket)
+
+        # Our own receipt, then the NewsVerified log for the same settlement
+        assert feed.publish_settled("default", 1, "Qm1", isVerified=True, txHash="0xa")
+        assert not feed.publish_settled("default", 1, None, isVerified=True, txHash="0xa")
+        # A peer's settlement seen only through NewsVerified
+        assert feed.publish_settled("default", 2, None, isVerified=False, txHash="0xb")
+        # Reorged out and mined again
+        feed.forget_settled("default", 1)
+        assert feed.publish_settled("default", 1, None, isVerified=True, txHash="0xc")
+        await asyncio.sleep(0.01)
+        return [json.loads(message) for message in websocket.sent]
+
+    events = asyncio.run(run())
+    assert [(e["event"], e["requestId"], e["txHash"]) for e in events] == [
+        (EVENT_SETTLED, 1, "0xa"), (EVENT_SETTLED, 2, "0xb"), (EVENT_SETTLED, 1, "0xc")]
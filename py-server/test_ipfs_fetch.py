@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for bounded ingestion - incremental JSON field extraction
+Documents are fed in small chunks to exercise every split point
+"""
+import json
+from ipfs_fetch import JSONFieldExtractor, _MISSING
+
+
+def extract(document: str, field="content", chunk_size=3):
+    data = document.encode("utf-8")
+    extractor = JSONFieldExtractor(field)
+    consumed = 0
+    for i in range(0, len(data), chunk_size):
+        consumed = i + chunk_size
+        value = extractor.feed(data[i:i + chunk_size])
+        if value is not _MISSING:
+            return value, consumed
+    return extractor.finish(), len(data)
+
+
+def test_matches_full_parse():
+    documents = [
+        {"content": "Plain claim", "title": "t"},
+        {"title": {"content": "nested, not top level"}, "content": "Escaped \"quote\" and \\ slash – ünïcode"},
+        {"meta": [1, {"a": "}"}], "content": {"nested": ["x", 2]}},
+        {"content": 42, "other": "x"},
+        {"content": None},
+        {"title": "no content here"},
+    ]
+    for document in documents:
+        text = json.dumps(document, ensure_ascii=False)
+        for chunk_size in (1, 2, 5, 64):
+            value, _ = extract(text, chunk_size=chunk_size)
+            assert value == document.get("content"), (text, chunk_size)
+
+
+def test_stops_reading_after_field():
+    text = json.dumps({"content": "short claim", "padding": "x" * 100000})
+    value, consumed = extract(text, chunk_size=16)
+    assert value == "short claim"
+    assert consumed < 100
+
+
+if __name__ == "__main__":
+    test_matches_full_parse()
+    test_stops_reading_after_field()
+    print("🎉 ALL IPFS FETCH TESTS PASSED!")
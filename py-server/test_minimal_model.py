@@ -4,7 +4,56 @@ Simple test for minimal claim verification model
 Only 2 tests with single setup call
 """
 import asyncio
-from minimal_sentence_model import setup_and_verify
+import json
+from config import Paths
+from minimal_sentence_model import setup_and_verify, extract_claim_evidence_features, bounded_tokens, proven_score
+
+
+def legacy_features(claim, evidence):
+    """The six lexical features as computed before tokenization was bounded"""
+    claim_len = min(len(claim), 200) / 200.0
+    evidence_len = min(len(evidence), 200) / 200.0
+    claim_words = min(len(claim.split()), 30) / 30.0
+    evidence_words = min(len(evidence.split()), 30) / 30.0
+    claim_set = set(claim.lower().split())
+    evidence_set = set(evidence.lower().split())
+    word_overlap = len(claim_set & evidence_set) / len(claim_set) if claim_set else 0.0
+    length_ratio = min(claim_len / (evidence_len + 0.001), 2.0) / 2.0 if evidence_len > 0 else 0.0
+    return [claim_len, evidence_len, claim_words, evidence_words, word_overlap, length_ratio]
+
+
+FEATURE_CORPUS = [
+    ("", ""),
+    ("The Earth is round", ""),
+    ("", "Satellite images show Earth's spherical shape"),
+    ("The Earth is round", "Satellite images and space observations show Earth's spherical shape"),
+    ("Python is a programming language", "PYTHON is a high-level, interpreted Programming Language"),
+    ("  leading and trailing  ", "\tleading\nand\r\ntrailing\x0b\x0c"),
+    ("unicode\u00a0spaces\u2003here\u3000too", "unicode spaces here too\x1c\x1d\x1e\x1fseparators"),
+    ("Ünïcödé CASE İstanbul ΣΊΣΥΦΟΣ", "ünïcödé case i̇stanbul σίσυφος straße STRASSE"),
+    ("word " * 40, "word " * 500),
+    ("a" * 250, "b " * 2000),
+    ("Breaking: markets fall 3% as rates rise", "Markets fell 3% on Tuesday after the central bank raised rates. " * 50),
+]
+
+
+def test_bounded_features_match_legacy_features():
+    for claim, evidence in FEATURE_CORPUS:
+        assert extract_claim_evidence_features(claim, evidence)[:6] == legacy_features(claim, evidence), (claim, evidence)
+
+
+def test_bounded_tokens_cap_pathological_input():
+    huge = "token " * 1_000_000
+    assert bounded_tokens(huge, max_tokens=100) == ["token"] * 100
+    assert len(bounded_tokens("x" * 10 + " y" * 1000, max_chars=20)) == 6
+
+def test_decision_comes_from_the_proven_output():
+    with open(Paths.PROOF_PATH) as f:
+        proof = json.load(f)
+    with open(Paths.WITNESS_PATH) as f:
+        [[expected]] = json.load(f)["pretty_elements"]["rescaled_outputs"]
+    assert abs(proven_score(proof) - float(expected)) < 1e-6
+
 
 async def test_minimal_verification():
     """Test the minimal verification model with 2 claim+evidence pairs"""
@@ -46,10 +95,9 @@ async def test_minimal_verification():
             
             if result:
                 print(f"✅ SUCCESS!")
-                print(f"🎯 Verification Score: {result['verification_score']:.4f}")
-                print(f"⚖️  Decision: {'✅ VERIFIED' if result['verified'] else '❌ NOT VERIFIED'}")
-                print(f"📊 Features: {[f'{f:.3f}' for f in result['features']]}")
-                print(f"🔐 Proof Generated & Verified: ✅")
+                print(f"⚖️  Decision: {'✅ VERIFIED' if result.binary_decision else '❌ NOT VERIFIED'}")
+                print(f"🔐 Proof: {len(result.proof)} bytes, {len(result.instances)} public inputs")
+                print(f"🔐 Proof Generated & Verified: {'✅' if result.proof_verified else '❌'}")
             else:
                 print(f"❌ FAILED - No result returned")
                 return False
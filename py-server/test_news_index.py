@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the local news index - event joins, filters and pagination
+"""
+from news_index import NewsIndex, STATUS_PENDING, STATUS_VERIFIED, STATUS_REJECTED
+
+
+class FakeCall:
+    def __init__(self, calls, name, result, *args):
+        self.calls, self.name, self.result, self.args = calls, name, result, args
+
+    def call(self):
+        self.calls.append((self.name,) + self.args)
+        return self.result
+
+
+class FakeFunctions:
+    """getNewsCount / getNewsArticles / getVerificationResponse over a list of articles"""
+
+    def __init__(self, count, responses):
+        self.count, self.responses, self.calls = count, responses, []
+
+    def getNewsCount(self):
+        return FakeCall(self.calls, "count", self.count)
+
+    def getNewsArticles(self, start, count):
+        rows = [(i, f"Qm{i}", "0xCCC", 2000 + i) for i in range(start + 1, min(start + count, self.count) + 1)]
+        return FakeCall(self.calls, "articles", rows, start, count)
+
+    def getVerificationResponse(self, request_id):
+        # Zeroed struct when nothing was submitted - (requestId, contentHash, isProofVerified, binaryDecision, ...)
+        response = self.responses.get(request_id, (0, "", False, False, b"", []))
+        return FakeCall(self.calls, "response", response, request_id)
+
+
+class FakeContract:
+    def __init__(self, count, responses=None):
+        self.functions = FakeFunctions(count, responses or {})
+
+
+def make_index():
+    index = NewsIndex(":memory:")
+    for request_id in range(1, 8):
+        reporter = "0xAAA" if request_id % 2 else "0xBBB"
+        index.record_submitted(request_id, f"Qm{request_id}", reporter, timestamp=1000 + request_id)
+    return index
+
+
+def test_verified_event_joins_article():
+    index = make_index()
+    index.record_verified(3, True, "0xtx")
+    index.record_verified(4, False)
+    assert index.get(3)["status"] == STATUS_VERIFIED
+    assert index.get(3)["content_hash"] == "Qm3"
+    assert index.get(4)["status"] == STATUS_REJECTED
+    assert index.get(5)["status"] == STATUS_PENDING
+
+
+def test_verified_before_submitted_keeps_status():
+    index = NewsIndex(":memory:")
+    index.record_verified(9, True)
+    assert index.query()["items"] == []
+    index.record_submitted(9, "Qm9", "0xAAA", timestamp=1)
+    assert index.get(9)["status"] == STATUS_VERIFIED
+    assert index.last_request_id() == 9
+
+
+def test_query_filters_and_pages():
+    index = make_index()
+    page = index.query(limit=3)
+    assert [item["request_id"] for item in page["items"]] == [7, 6, 5]
+    page = index.query(limit=3, cursor=page["next_cursor"])
+    assert [item["request_id"] for item in page["items"]] == [4, 3, 2]
+    page = index.query(limit=3, cursor=page["next_cursor"])
+    assert [item["request_id"] for item in page["items"]] == [1]
+    assert page["next_cursor"] is None
+
+    assert [item["request_id"] for item in index.query(reporter="0xbbb")["items"]] == [6, 4, 2]
+    assert [item["request_id"] for item in index.query(since=1003, until=1006)["items"]] == [5, 4, 3]
+    index.record_verified(2, True)
+    assert [item["request_id"] for item in index.query(status=STATUS_VERIFIED)["items"]] == [2]
+
+
+def test_backfill_fills_gaps_below_later_ids():
+    index = NewsIndex(":memory:")
+    for request_id in (1, 2, 5, 9):
+        index.record_submitted(request_id, f"Qm{request_id}", "0xAAA", timestamp=1)
+    index.record_verified(7, True)  # status without the article still counts as missing
+    assert index.missing_request_ids(10) == [3, 4, 6, 7, 8, 10]
+
+    contract = FakeContract(10)
+    index.backfill(contract, page_size=2)
+    reads = [call[1:] for call in contract.functions.calls if call[0] == "articles"]
+    assert reads == [(2, 2), (5, 2), (7, 1), (9, 1)]
+    assert index.missing_request_ids(10) == []
+    assert index.get(7)["status"] == STATUS_VERIFIED and index.get(7)["content_hash"] == "Qm7"
+
+
+def test_backfill_settles_failed_responses():
+    index = make_index()
+    contract = FakeContract(7, {
+        2: (2, "Qm2", True, True, b"proof", [1]),
+        3: (3, "Qm3", False, False, b"", []),  # failed result - proof not verified, still settled
+    })
+    index.backfill(contract)
+    assert index.get(2)["status"] == STATUS_VERIFIED
+    assert index.get(3)["status"] == STATUS_REJECTED
+    assert index.get(4)["status"] == STATUS_PENDING
+
+
+if __name__ == "__main__":
+    test_verified_event_joins_article()
+    test_verified_before_submitted_keeps_status()
+    test_query_filters_and_pages()
+    test_backfill_fills_gaps_below_later_ids()
+    test_backfill_settles_failed_responses()
+    print("🎉 ALL NEWS INDEX TESTS PASSED!")
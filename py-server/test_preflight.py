@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for pre-flight verification - the gas estimate and batching of checks
+A fake verifier stands in for the py-evm deployment
+"""
+import asyncio
+
+import pytest
+
+import preflight
+from preflight import (PreflightChecker, PreflightReport, estimate_submission_gas, dynamic_slots,
+                       SSTORE_GAS, TX_BASE_GAS, CALLDATA_BYTE_GAS, CALLDATA_ZERO_BYTE_GAS)
+
+CID = "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG"  # 46 characters
+
+
+def make_response(request_id=1, proof=b"\x01" * 64, instances=(5, 6)):
+    return (request_id, CID, True, True, proof, list(instances))
+
+
+class FakeVerifier:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def check_many(self, responses):
+        self.batches.append([response[0] for response in responses])
+        if self.fail:
+            raise RuntimeError("verifier.bin not found")
+        return [PreflightReport(response[0] % 2 == 1, 1000) for response in responses]
+
+
+def test_storage_slots_for_strings_and_bytes():
+    assert dynamic_slots(0) == 1
+    assert dynamic_slots(31) == 1
+    assert dynamic_slots(32) == 2
+    assert dynamic_slots(len(CID)) == 3  # length slot plus two data slots
+
+
+def test_gas_estimate_counts_every_part(monkeypatch):
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_GAS_BUFFER", 0)
+    calldata = b"\x00" * 10 + b"\x01" * 20
+    proof = b"\x01" * 64
+    gas = estimate_submission_gas(50000, calldata, CID, proof, [1, 2, 3])
+    # requestId + flags, contentHash (3), proof (1 + 2), pubInputs (1 + 3)
+    slots = 2 + 3 + 3 + 4
+    calldata_gas = 10 * CALLDATA_ZERO_BYTE_GAS + 20 * CALLDATA_BYTE_GAS
+    assert gas == TX_BASE_GAS + calldata_gas + 50000 + slots * SSTORE_GAS
+
+
+def test_calldata_matches_the_submission():
+    pytest.importorskip("eth_abi")
+    from preflight import submission_calldata
+
+    short = submission_calldata(make_response(proof=b"\x01" * 32, instances=[1]))
+    longer = submission_calldata(make_response(proof=b"\x01" * 64, instances=[1, 2]))
+    assert short[:4] == longer[:4]  # same selector
+    assert len(longer) - len(short) == 64  # one more proof word, one more public input
+
+
+def test_checks_within_the_window_run_as_one_batch(monkeypatch):
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_BATCH_WINDOW", 0.01)
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_BATCH_SIZE", 8)
+
+    async def run():
+        verifier = FakeVerifier()
+        checker = PreflightChecker(verifier)
+        reports = await asyncio.gather(*(checker.check(make_response(i)) for i in range(1, 4)))
+        return verifier.batches, [report.ok for report in reports]
+
+    batches, oks = asyncio.run(run())
+    assert batches == [[1, 2, 3]]
+    assert oks == [True, False, True]
+
+
+def test_full_batch_is_flushed_without_waiting(monkeypatch):
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_BATCH_WINDOW", 60)
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_BATCH_SIZE", 2)
+
+    async def run():
+        verifier = FakeVerifier()
+        checker = PreflightChecker(verifier)
+        await asyncio.wait_for(asyncio.gather(checker.check(make_response(1)), checker.check(make_response(3))), 1)
+        return verifier.batches
+
+    assert asyncio.run(run()) == [[1, 3]]
+
+
+def test_cancelled_caller_does_not_strand_its_batch(monkeypatch):
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_BATCH_WINDOW", 60)
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_BATCH_SIZE", 2)
+
+    async def run():
+        checker = PreflightChecker(FakeVerifier())
+        first = asyncio.create_task(checker.check(make_response(1)))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(checker.check(make_response(3)))
+        await asyncio.sleep(0)
+        second.cancel()  # e.g. a reorg cancel of the job that filled the batch
+        report = await asyncio.wait_for(first, 1)
+        return report.ok, second.cancelled()
+
+    assert asyncio.run(run()) == (True, True)
+
+
+def test_setup_failure_reaches_every_caller(monkeypatch):
+    monkeypatch.setattr(preflight.Config, "PREFLIGHT_BATCH_WINDOW", 0.01)
+
+    async def run():
+        checker = PreflightChecker(FakeVerifier(fail=True))
+        return await asyncio.gather(checker.check(make_response(1)), checker.check(make_response(2)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the isolated prover process - watchdog, crashes, recycling and re-warming
+A fake worker stands in for torch/ezkl, so the real spawn/pipe machinery is exercised
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from prover_worker import ProverProcess, ProverTimeout, ProverCrashed, PROVE, WARM_UP
+from structured_logging import set_context
+
+
+def fake_worker(conn):
+    """Answers like worker_main - 'hang' and 'crash' claims misbehave on purpose"""
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        kind, *args = job
+        if kind == WARM_UP:
+            message = ("ok", [])
+        elif kind == PROVE:
+            claim, evidence, context = args
+            if claim == "hang":
+                time.sleep(60)
+            if claim == "crash":
+                os._exit(1)
+            if claim == "fail":
+                message = ("error", "RuntimeError: bad proof")
+            else:
+                message = ("ok", {"pid": os.getpid(), "context": context})
+        else:
+            message = ("ok", len(args[0]))
+        conn.send(message + (1024,))
+
+
+async def settled(prover):
+    """Wait for a background re-warm, if one was started"""
+    if prover._warm_task is not None:
+        await asyncio.wait_for(prover._warm_task, 10)
+
+
+def test_jobs_run_in_one_worker_with_the_callers_context():
+    async def run():
+        prover = ProverProcess(target=fake_worker)
+        try:
+            set_context({"request_id": 7})
+            first = await prover.verify("claim", "evidence", 10)
+            second = await prover.verify("claim", "evidence", 10)
+            with pytest.raises(RuntimeError, match="bad proof"):
+                await prover.verify("fail", "evidence", 10)
+            return first, second, prover.restarts
+        finally:
+            prover.stop()
+
+    first, second, restarts = asyncio.run(run())
+    assert first["pid"] == second["pid"]
+    assert first["context"]["request_id"] == 7
+    assert restarts == 0
+
+
+def test_timeout_kills_the_worker_and_warms_a_replacement():
+    async def run():
+        prover = ProverProcess(target=fake_worker)
+        try:
+            before = (await prover.verify("claim", "evidence", 10))["pid"]
+            with pytest.raises(ProverTimeout):
+                await prover.verify("hang", "evidence", 0.5)
+            await settled(prover)
+            assert prover.alive  # warmed before anyone asked
+            after = (await prover.verify("claim", "evidence", 10))["pid"]
+            return before, after, prover.restarts
+        finally:
+            prover.stop()
+
+    before, after, restarts = asyncio.run(run())
+    assert before != after
+    assert restarts == 1
+
+
+def test_crash_is_reported_and_the_worker_replaced():
+    async def run():
+        prover = ProverProcess(target=fake_worker)
+        try:
+            with pytest.raises(ProverCrashed):
+                await prover.verify("crash", "evidence", 10)
+            await settled(prover)
+            return prover.alive, prover.restarts
+        finally:
+            prover.stop()
+
+    assert asyncio.run(run()) == (True, 1)
+
+
+def test_cancel_kills_the_worker_mid_job():
+    async def run():
+        prover = ProverProcess(target=fake_worker)
+        try:
+            await prover.warm_up(10)
+            pid = prover._process.pid
+            job = asyncio.create_task(prover.verify("hang", "evidence", 60))
+            await asyncio.sleep(0.2)
+            job.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await job
+            await settled(prover)
+            return pid, prover._process.pid, prover.restarts
+        finally:
+            prover.stop()
+
+    old_pid, new_pid, restarts = asyncio.run(run())
+    assert old_pid != new_pid
+    assert restarts == 1
+
+
+def test_worker_is_recycled_after_max_jobs_and_rewarmed():
+    async def run():
+        prover = ProverProcess(max_jobs=2, target=fake_worker)
+        try:
+            pids = [(await prover.verify("claim", "evidence", 10))["pid"] for _ in range(2)]
+            assert not prover.alive  # recycled right after the second job
+            await settled(prover)
+            assert prover.alive
+            pids.append((await prover.verify("claim", "evidence", 10))["pid"])
+            return pids, prover.restarts
+        finally:
+            prover.stop()
+
+    (first, second, third), restarts = asyncio.run(run())
+    assert first == second != third
+    assert restarts == 1
+
+
+def test_failed_warm_up_is_not_retried_in_a_loop():
+    async def run():
+        prover = ProverProcess(target=fake_worker)
+        try:
+            await prover.warm_up(10)
+            prover._conn.send((PROVE, "hang", "", {}))  # wedge the worker so warm-up times out
+            with pytest.raises(ProverTimeout):
+                await prover.warm_up(0.5)
+            return prover._warm_task, prover.alive
+        finally:
+            prover.stop()
+
+    assert asyncio.run(run()) == (None, False)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for the proof scheduler - priority, quotas and fair sharing
+No prover needed: jobs are plain coroutines
+"""
+import asyncio
+import contextvars
+from scheduler import ProofScheduler, SchedulerBusy, PRIORITY_CHAIN, PRIORITY_INTERACTIVE
+
+
+def make_job(order, name, gate=None):
+    async def job():
+        if gate is not None:
+            await gate.wait()
+        order.append(name)
+        return name
+    return job
+
+
+def test_chain_jobs_served_before_interactive():
+    async def run():
+        scheduler = ProofScheduler(max_queue=10, client_quota=10, workers=1)
+        order = []
+        gate = asyncio.Event()
+        blocker = asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job(order, "blocker", gate), client_id="a"))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job(order, "a1"), client_id="a")),
+            asyncio.create_task(scheduler.submit(PRIORITY_CHAIN, make_job(order, "chain"))),
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+        await scheduler.stop()
+        return order
+
+    assert asyncio.run(run()) == ["blocker", "chain", "a1"]
+
+
+def test_round_robin_between_clients():
+    async def run():
+        scheduler = ProofScheduler(max_queue=10, client_quota=10, workers=1)
+        order = []
+        gate = asyncio.Event()
+        blocker = asyncio.create_task(scheduler.submit(PRIORITY_CHAIN, make_job(order, "blocker", gate)))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job(order, f"a{i}"), client_id="a"))
+                 for i in range(3)]
+        tasks.append(asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job(order, "b0"), client_id="b")))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+        await scheduler.stop()
+        return order
+
+    assert asyncio.run(run()) == ["blocker", "a0", "b0", "a1", "a2"]
+
+
+def test_quota_and_queue_limit_reply_busy():
+    async def run():
+        scheduler = ProofScheduler(max_queue=2, client_quota=1, workers=1, initial_eta=2.0)
+        gate = asyncio.Event()
+        blocker = asyncio.create_task(scheduler.submit(PRIORITY_CHAIN, make_job([], "blocker", gate)))
+        await asyncio.sleep(0)
+        first = asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job([], "a0"), client_id="a"))
+        await asyncio.sleep(0)
+
+        errors = []
+        for client_id in ("a", "b", "c"):
+            try:
+                task = asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job([], client_id), client_id=client_id))
+                await asyncio.sleep(0)
+                if task.done():
+                    task.result()
+            except SchedulerBusy as e:
+                errors.append((client_id, e.reason, e.position))
+
+        gate.set()
+        await asyncio.gather(blocker, first, return_exceptions=True)
+        await scheduler.stop()
+        return errors
+
+    errors = asyncio.run(run())
+    assert ("a", "client quota exceeded", 2) in errors
+    assert ("c", "queue full", 3) in errors
+    assert all(client_id != "b" for client_id, _, _ in errors)
+
+
+def test_cancelled_caller_cancels_running_job():
+    async def run():
+        scheduler = ProofScheduler(max_queue=10, client_quota=10, workers=1)
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def slow_job():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(scheduler.submit(PRIORITY_CHAIN, slow_job))
+        await started.wait()
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        # The worker survives and serves the next job
+        result = await asyncio.wait_for(scheduler.submit(PRIORITY_CHAIN, make_job([], "next")), 1)
+        await scheduler.stop()
+        return result
+
+    assert asyncio.run(run()) == "next"
+
+
+def test_failed_queued_notice_withdraws_the_job():
+    async def run():
+        scheduler = ProofScheduler(max_queue=10, client_quota=1, workers=1)
+        gate = asyncio.Event()
+        order = []
+        blocker = asyncio.create_task(scheduler.submit(PRIORITY_CHAIN, make_job(order, "blocker", gate)))
+        await asyncio.sleep(0.01)  # the only worker is busy with the blocker
+
+        async def client_gone(position, eta):
+            raise ConnectionError("client went away")
+
+        try:
+            await scheduler.submit(PRIORITY_INTERACTIVE, make_job(order, "orphan"), client_id="a", on_queued=client_gone)
+        except ConnectionError:
+            pass
+        queued_after_failure = scheduler.queue_length()
+
+        # A cancelled waiter is withdrawn too, freeing its client's quota slot
+        waiter = asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job(order, "cancelled"), client_id="a"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        follow_up = asyncio.create_task(scheduler.submit(PRIORITY_INTERACTIVE, make_job(order, "a1"), client_id="a"))
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(blocker, follow_up), 1)
+        await scheduler.stop()
+        return queued_after_failure, order
+
+    queued_after_failure, order = asyncio.run(run())
+    assert queued_after_failure == 0
+    assert order == ["blocker", "a1"]
+
+
+def test_job_runs_in_the_submitters_context():
+    request_id = contextvars.ContextVar("request_id", default=None)
+
+    async def run():
+        scheduler = ProofScheduler(max_queue=10, client_quota=10, workers=1)
+
+        async def job():
+            return request_id.get()
+
+        async def submit(value):
+            request_id.set(value)
+            return await scheduler.submit(PRIORITY_INTERACTIVE, job, client_id=value)
+
+        results = await asyncio.gather(submit("a"), submit("b"))
+        await scheduler.stop()
+        return results
+
+    assert asyncio.run(run()) == ["a", "b"]
+
+
+if __name__ == "__main__":
+    test_chain_jobs_served_before_interactive()
+    test_round_robin_between_clients()
+    test_quota_and_queue_limit_reply_busy()
+    test_cancelled_caller_cancels_running_job()
+    test_failed_queued_notice_withdraws_the_job()
+    test_job_runs_in_the_submitters_context()
+    print("🎉 ALL SCHEDULER TESTS PASSED!")
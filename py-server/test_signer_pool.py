@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the verifier signer pool - account choice and nonce streams
+A fake web3 hands out accounts and transaction counts
+"""
+import asyncio
+
+import pytest
+
+from signer_pool import SignerPool
+
+
+class FakeAccount:
+    def __init__(self, key):
+        self.key = key
+        self.address = f"0xaddr{key[2:]}"
+
+
+class FakeAccountFactory:
+    def from_key(self, key):
+        return FakeAccount(key)
+
+
+class FakeEth:
+    def __init__(self):
+        self.account = FakeAccountFactory()
+        self.counts = {}
+        self.count_calls = 0
+
+    def get_transaction_count(self, address, block):
+        self.count_calls += 1
+        return self.counts.get(address, 0)
+
+
+class FakeWeb3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+def test_least_loaded_funded_account_is_picked():
+    pool = SignerPool(FakeWeb3(), ["0x1", "0x2", "0x3"])
+    first, second, third = pool.signers
+    first.in_flight = 1
+    second.balance = 0  # below SIGNER_MIN_BALANCE_WEI
+    assert pool.pick() is third
+    third.in_flight = 2
+    assert pool.pick() is first
+
+
+def test_nonces_are_sequential_per_account():
+    async def run():
+        web3 = FakeWeb3()
+        web3.eth.counts["0xaddr1"] = 7
+        pool = SignerPool(web3, ["0x1"])
+        nonces = []
+        for _ in range(3):
+            async with pool.acquire() as slot:
+                nonces.append(await slot.take_nonce())
+                assert await slot.take_nonce() == nonces[-1]  # one nonce per transaction
+        return nonces, web3.eth.count_calls
+
+    nonces, count_calls = asyncio.run(run())
+    assert nonces == [7, 8, 9]
+    assert count_calls == 1
+
+
+def test_failure_before_taking_a_nonce_leaves_no_gap():
+    async def run():
+        pool = SignerPool(FakeWeb3(), ["0x1"])
+        with pytest.raises(ValueError):
+            async with pool.acquire():
+                raise ValueError("Transaction would fail")  # e.g. estimate_gas reverted
+        async with pool.acquire() as slot:
+            return await slot.take_nonce(), pool.signers[0].in_flight
+
+    assert asyncio.run(run()) == (0, 1)
+
+
+def test_failure_after_taking_a_nonce_forces_a_resync():
+    async def run():
+        web3 = FakeWeb3()
+        pool = SignerPool(web3, ["0x1"])
+        with pytest.raises(RuntimeError):
+            async with pool.acquire() as slot:
+                await slot.take_nonce()
+                raise RuntimeError("send failed")
+        assert pool.signers[0].nonce is None
+        web3.eth.counts["0xaddr1"] = 1  # the transaction did reach the mempool
+        async with pool.acquire() as slot:
+            return await slot.take_nonce()
+
+    assert asyncio.run(run()) == 1
+
+
+def test_pools_on_one_chain_share_nonce_streams():
+    async def run():
+        web3 = FakeWeb3()
+        # Different endpoints of chain 1287 - pools are keyed by chain, not URL
+        first = SignerPool(web3, ["0x1", "0x2"], chain_id=1287)
+        second = SignerPool(FakeWeb3(), ["0x2"], chain_id=1287)
+        other_chain = SignerPool(web3, ["0x2"], chain_id=1284)
+        assert second.signers[0] is first.signers[1]
+        assert other_chain.signers[0] is not first.signers[1]
+
+        nonces = []
+        for pool in (second, second, other_chain):
+            async with pool.acquire() as slot:
+                nonces.append(await slot.take_nonce())
+        first.signers[0].in_flight = 5  # steer the first pool to the shared account
+        async with first.acquire() as slot:
+            nonces.append(await slot.take_nonce())
+        return nonces
+
+    assert asyncio.run(run()) == [0, 1, 0, 2]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the startup sequence - readiness reported through health_check, and targets
+started only once the prover is warm and stopped again if warm-up fails
+The prover and chain targets are faked; only the warm-up orchestration is real
+"""
+import asyncio
+import json
+
+import event_listener
+from readiness import Readiness, STATE_STARTING, STATE_READY, STATE_FAILED
+from targets import ChainTarget
+
+
+class FakeWebSocket:
+    """A client that sends the given messages, then disconnects"""
+
+    def __init__(self, *messages):
+        self.messages = [json.dumps(message) for message in messages]
+        self.sent = []
+        self.remote_address = ("127.0.0.1", 50000)
+
+    def __aiter__(self):
+        return self._receive()
+
+    async def _receive(self):
+        for message in self.messages:
+            yield message
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+async def health_status():
+    websocket = FakeWebSocket({"type": "health_check"})
+    await event_listener.handle_client(websocket, "/")
+    [reply] = websocket.sent
+    assert reply["type"] == "health_check_response"
+    return reply["status"]
+
+
+def make_target(name):
+    return ChainTarget(name, f"wss://{name}", f"https://{name}", "0x" + "1" * 40)
+
+
+def setup_startup(monkeypatch, missing=(), gate=None, start_targets=None):
+    """Fake prover warm-up and target start-up; returns the targets that were started"""
+    monkeypatch.setattr(event_listener, "readiness", Readiness())
+    monkeypatch.setattr(event_listener.Config, "PREFLIGHT_ENABLED", False)
+    monkeypatch.setattr(event_listener.Config, "BATCH_API_ENABLED", False)
+    started = []
+
+    async def warm_prover():
+        if gate is not None:
+            await gate.wait()
+        return list(missing)
+
+    async def fake_start_targets():
+        started.extend(event_listener.targets)
+
+    monkeypatch.setattr(event_listener, "warm_prover", warm_prover)
+    monkeypatch.setattr(event_listener, "start_targets", start_targets or fake_start_targets)
+    monkeypatch.setattr(event_listener, "targets", [make_target("moonbase")])
+    return started
+
+
+def test_health_check_reports_starting_until_warm_up_completes(monkeypatch):
+    gate = asyncio.Event()
+    started = setup_startup(monkeypatch, gate=gate)
+
+    async def run():
+        warm_up = asyncio.create_task(event_listener.warm_up())
+        await asyncio.sleep(0.01)
+        before = await health_status()
+        no_targets_yet = list(started)
+        gate.set()
+        await asyncio.wait_for(warm_up, 10)
+        return before, no_targets_yet, await health_status()
+
+    before, no_targets_yet, after = asyncio.run(run())
+    assert (before, after) == (STATE_STARTING, STATE_READY)
+    assert no_targets_yet == []  # no chain jobs before the prover is warm
+    assert [target.name for target in started] == ["moonbase"]
+
+
+def test_missing_artifacts_fail_before_any_target_starts(monkeypatch):
+    started = setup_startup(monkeypatch, missing=["artifacts/keys/test.vk"])
+
+    async def run():
+        await event_listener.warm_up()
+        return await health_status()
+
+    assert asyncio.run(run()) == STATE_FAILED
+    assert "artifacts/keys/test.vk" in event_listener.readiness.error
+    assert started == []
+
+
+def test_failed_warm_up_stops_started_targets(monkeypatch):
+    running = []
+
+    async def start_targets():
+        # The first target comes up, the second cannot be started
+        first, second = event_listener.targets
+        task = asyncio.create_task(asyncio.sleep(60))
+        first.tasks.append(task)
+        first.job_tasks[(1, "0xa")] = job = asyncio.create_task(asyncio.sleep(60))
+        running.extend([task, job])
+        raise RuntimeError(f"Cannot reach {second.ws_uri}")
+
+    setup_startup(monkeypatch, start_targets=start_targets)
+    monkeypatch.setattr(event_listener, "targets", [make_target("moonbase"), make_target("local")])
+
+    async def run():
+        await event_listener.warm_up()
+        await asyncio.sleep(0)
+        return await health_status()
+
+    assert asyncio.run(run()) == STATE_FAILED
+    assert all(task.cancelled() for task in running)
+    assert event_listener.targets[0].tasks == []
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the queued structured logger - context, truncation, sampling and overflow
+"""
+import asyncio
+import json
+import logging
+import queue
+
+from config import Config
+from structured_logging import JsonFormatter, _NonBlockingQueueHandler, bind, truncate
+
+
+def make_logger(maxsize=100):
+    log_queue = queue.Queue(maxsize=maxsize)
+    handler = _NonBlockingQueueHandler(log_queue)
+    logger = logging.getLogger(f"test_structured_logging.{id(log_queue)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger, handler, log_queue
+
+
+def drain(log_queue):
+    formatter = JsonFormatter()
+    records = []
+    while not log_queue.empty():
+        records.append(json.loads(formatter.format(log_queue.get_nowait())))
+    return records
+
+
+def test_context_is_per_task():
+    logger, _, log_queue = make_logger()
+
+    async def job(request_id):
+        bind(request_id=request_id)
+        await asyncio.sleep(0)
+        logger.info("proving")
+
+    async def run():
+        await asyncio.gather(job(1), job(2))
+
+    asyncio.run(run())
+    records = drain(log_queue)
+    assert sorted(r["request_id"] for r in records) == [1, 2]
+    assert all("_sampled" not in r for r in records)
+
+
+def test_large_payloads_are_truncated():
+    logger, _, log_queue = make_logger()
+    logger.info("claim %s", "x" * (Config.LOG_MAX_FIELD_CHARS * 4))
+    logger.info("done", extra={"fields": {"evidence": "y" * (Config.LOG_MAX_FIELD_CHARS * 4)}})
+    records = drain(log_queue)
+    assert len(records[0]["msg"]) < Config.LOG_MAX_FIELD_CHARS + 40
+    assert len(records[1]["evidence"]) < Config.LOG_MAX_FIELD_CHARS + 40
+    assert truncate("short") == "short"
+
+
+def test_debug_output_follows_request_sampling():
+    logger, _, log_queue = make_logger()
+
+    async def job(sampled):
+        bind(request_id=1, _sampled=sampled)
+        logger.debug("features")
+        logger.info("done")
+
+    asyncio.run(job(False))
+    assert [r["msg"] for r in drain(log_queue)] == ["done"]
+    asyncio.run(job(True))
+    assert [r["msg"] for r in drain(log_queue)] == ["features", "done"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    logger, handler, log_queue = make_logger(maxsize=2)
+    for i in range(5):
+        logger.info("record %d", i)
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for chain target configuration - TARGETS_PATH parsing and per-target store paths
+"""
+import json
+import os
+import tempfile
+
+import pytest
+
+import targets
+from targets import DEFAULT_TARGET_NAME, load_targets, target_path
+
+
+def write_targets(entries):
+    path = os.path.join(tempfile.mkdtemp(), "targets.json")
+    with open(path, "w") as f:
+        json.dump(entries, f)
+    return path
+
+
+def entry(name, **fields):
+    return {"name": name, "ws_uri": f"wss://{name}", "http_uri": f"https://{name}",
+            "contract_address": "0x" + "1" * 40, **fields}
+
+
+def test_single_default_target_without_targets_file(monkeypatch):
+    monkeypatch.setattr(targets.Config, "TARGETS_PATH", "")
+    [target] = load_targets()
+    assert target.name == DEFAULT_TARGET_NAME
+    assert target.http_uri == targets.Config.WEB3_HTTP_URI
+    assert target.private_keys is None  # falls back to the global verifier keys
+    assert target.news_index_path == targets.Config.NEWS_INDEX_PATH
+
+
+def test_targets_file_gives_each_target_its_own_stores(monkeypatch):
+    path = write_targets([entry("moonbase", private_keys=["0xabc"]), entry("local", abi_path="./other.json")])
+    monkeypatch.setattr(targets.Config, "TARGETS_PATH", path)
+    monkeypatch.setattr(targets.Config, "NEWS_INDEX_PATH", "news_index.db")
+    monkeypatch.setattr(targets.Config, "FLEET_STORE_PATH", "")
+
+    moonbase, local = load_targets()
+    assert (moonbase.name, moonbase.ws_uri, moonbase.private_keys) == ("moonbase", "wss://moonbase", ["0xabc"])
+    assert local.abi_path == "./other.json" and moonbase.abi_path == targets.Config.CONTRACT_ABI_PATH
+    assert (moonbase.news_index_path, local.news_index_path) == ("news_index.moonbase.db", "news_index.local.db")
+    assert moonbase.fleet_store_path == ""  # fleet mode stays off
+
+
+def test_invalid_targets_files_are_rejected(monkeypatch):
+    for entries, message in (
+        ([entry("a"), entry("a")], "Duplicate target names"),
+        ([{"name": "a", "ws_uri": "wss://a"}], "missing"),
+        ([], "No targets"),
+    ):
+        monkeypatch.setattr(targets.Config, "TARGETS_PATH", write_targets(entries))
+        with pytest.raises(ValueError, match=message):
+            load_targets()
+
+
+def test_target_path():
+    assert target_path("fleet.db", DEFAULT_TARGET_NAME) == "fleet.db"
+    assert target_path("data/fleet.db", "moonbase") == "data/fleet.moonbase.db"
+    assert target_path("", "moonbase") == ""
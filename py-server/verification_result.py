@@ -0,0 +1,26 @@
+class VerificationResult:
+    """
+    Outcome of one claim verification, in the exact shape submitVerificationResponse needs:
+    proof as raw bytes and public inputs as uint256 integers
+    """
+    __slots__ = ("proof_verified", "binary_decision", "proof", "instances")
+
+    def __init__(self, proof_verified: bool, binary_decision: int, proof: bytes, instances: list):
+        self.proof_verified = proof_verified
+        self.binary_decision = binary_decision
+        self.proof = proof
+        self.instances = instances
+
+    @classmethod
+    def failed(cls):
+        """Placeholder submitted on-chain when verification could not complete"""
+        return cls(False, 0, b'\x00' * 32, [0])
+
+    def to_dict(self):
+        """WebSocket serialization - proof and public inputs as 0x-prefixed hex"""
+        return {
+            "proof_verified": self.proof_verified,
+            "binary_decision": self.binary_decision,
+            "proof": "0x" + self.proof.hex(),
+            "pub_inputs": [hex(x) for x in self.instances],
+        }